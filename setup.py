@@ -7,6 +7,7 @@ setup(
     package_dir={"": "src"},
     install_requires=[
         "notion-client>=1.0.0",
+        "httpx>=0.23.0",
         "watchdog>=3.0.0",
         "markdown>=3.4.3",
         "python-frontmatter>=1.0.0",
@@ -14,6 +15,9 @@ setup(
         "pyyaml>=6.0",
         "python-dotenv>=1.0.0",
     ],
+    extras_require={
+        "http2": ["httpx[http2]>=0.23.0"],
+    },
     entry_points={
         "console_scripts": [
             "notion-md-sync=notion_md_sync.cli:main",
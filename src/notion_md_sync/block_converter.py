@@ -2,10 +2,162 @@
 Converter between Markdown elements and Notion blocks.
 """
 
-from typing import Dict, List, Any, Tuple
+from collections import namedtuple
+from typing import Dict, Iterable, List, Any, Optional, Tuple
+import io
 import re
 
 
+# Lightweight block representation for code that inspects or filters blocks
+# before they are sent to Notion. ``kind`` is the Notion block type and
+# ``lang`` is only set for code blocks.
+Block = namedtuple('Block', ('kind', 'text', 'lang'))
+
+
+# Compiled on first use so importing the module (e.g. for CLI startup)
+# does not pay for regex compilation
+_fence_close_re = None
+
+
+def _get_fence_close_re() -> re.Pattern:
+    """Return the pattern for a closing code fence line."""
+    global _fence_close_re
+    if _fence_close_re is None:
+        # A line whose first non-blank characters are ```
+        _fence_close_re = re.compile(r'^[ \t]*```', re.MULTILINE)
+    return _fence_close_re
+
+
+# Notion only supports h1-h3; index with ``level - 1``
+_HEADING_TYPES = ('heading_1', 'heading_2', 'heading_3')
+_HASHES = ('#', '##', '###')
+
+
+def _make_block(block_type: str, text: str) -> Dict[str, Any]:
+    """Create a Notion block of the given type holding a single text run."""
+    if not text:
+        # Notion accepts an empty rich_text array, e.g. for an empty code block
+        return {"type": block_type, block_type: {"rich_text": []}}
+    # A single nested literal builds faster than assembling the pieces
+    return {"type": block_type, block_type: {"rich_text": [{"type": "text", "text": {"content": text}}]}}
+
+
+def _make_code_block(code: str, language: str) -> Dict[str, Any]:
+    """Create a Notion code block."""
+    block = _make_block("code", code)
+    block["code"]["language"] = language
+    return block
+
+
+def to_notion_dict(block: Block) -> Dict[str, Any]:
+    """
+    Convert a lightweight block into the Notion API block format.
+
+    Args:
+        block: Block as returned by BlockConverter.parse_blocks.
+
+    Returns:
+        Notion block object.
+    """
+    if block.lang is None:
+        return _make_block(block.kind, block.text)
+    return _make_code_block(block.text, block.lang)
+
+
+def _scan_blocks(markdown_content: str) -> List[Tuple[str, str, Optional[str]]]:
+    """
+    Split markdown content into block tokens.
+
+    This only classifies lines; building the Notion block dicts is left to
+    the caller so the scanning loop stays free of dict construction.
+
+    Args:
+        markdown_content: Raw markdown content.
+
+    Returns:
+        List of (notion_block_type, text, language) tuples. The language is
+        None for everything except code blocks.
+    """
+    # This is a simplified implementation that handles basic elements
+    # A full implementation would need to parse the markdown AST
+    fence_close_re = _get_fence_close_re()
+    tokens = []
+    append = tokens.append
+    # Work on offsets into a single string with '\n' line endings so code
+    # blocks can be skipped with one search instead of a per-line loop
+    if '\r' in markdown_content:
+        markdown_content = markdown_content.replace('\r\n', '\n').replace('\r', '\n')
+    find = markdown_content.find
+    n = len(markdown_content)
+    
+    pos = 0
+    while pos < n:
+        eol = find('\n', pos)
+        if eol == -1:
+            eol = n
+        line = markdown_content[pos:eol].strip()
+        pos = eol + 1
+        
+        # Skip empty lines
+        if not line:
+            continue
+        
+        # Every block start is identified by its first character, and the
+        # few characters after it are checked by hand rather than by regex
+        c0 = line[0]
+        
+        # Headings: one to three '#' followed by whitespace
+        if c0 == '#':
+            level = len(line) - len(line.lstrip('#'))
+            if level <= 3 and line[level:level + 1].isspace():
+                append((_HEADING_TYPES[level - 1], line[level:].lstrip(), None))
+                continue
+            
+        # Code blocks
+        elif c0 == '`' and line.startswith('```'):
+            language = line[3:].strip()
+            closing = fence_close_re.search(markdown_content, pos)
+            if closing:
+                # Drop the newline that ends the last code line
+                code = markdown_content[pos:closing.start() - 1]
+                # Skip closing ```
+                eol = find('\n', closing.end())
+                end = n if eol == -1 else eol + 1
+            else:
+                # Unterminated block: the code runs to the end of the content
+                code = markdown_content[pos:]
+                if code.endswith('\n'):
+                    code = code[:-1]
+                end = n
+            append(('code', code, language))
+            pos = end
+            continue
+            
+        # Bullet lists
+        elif (c0 == '-' or c0 == '*') and line[1:2] == ' ':
+            append(('bulleted_list_item', line[2:].strip(), None))
+            continue
+            
+        # Quotes
+        elif c0 == '>' and line[1:2] == ' ':
+            append(('quote', line[2:].strip(), None))
+            continue
+            
+        # Numbered lists: digits, a '.', then whitespace
+        elif c0.isdecimal():
+            j = 1
+            while line[j:j + 1].isdecimal():
+                j += 1
+            if line[j:j + 1] == '.' and line[j + 1:j + 2].isspace():
+                append(('numbered_list_item', line[j + 1:].lstrip(), None))
+                continue
+            
+        # Paragraphs (default)
+        append(('paragraph', line, None))
+            
+    return tokens
+
+
 class BlockConverter:
     """Converter between markdown elements and Notion blocks."""
 
@@ -25,6 +177,22 @@ class BlockConverter:
         """Initialize the block converter."""
         pass
 
+    def parse_blocks(self, markdown_content: str) -> List[Block]:
+        """
+        Parse markdown content into lightweight blocks.
+
+        Unlike markdown_to_blocks this does not build the nested Notion
+        dicts; convert the blocks that are actually uploaded with
+        to_notion_dict.
+
+        Args:
+            markdown_content: Raw markdown content.
+
+        Returns:
+            List of Block tuples.
+        """
+        return list(map(Block._make, _scan_blocks(markdown_content)))
+
     def markdown_to_blocks(self, markdown_content: str) -> List[Dict[str, Any]]:
         """
         Convert markdown content to Notion blocks.
@@ -35,219 +203,95 @@ class BlockConverter:
         Returns:
             List of Notion block objects.
         """
-        # This is a simplified implementation that handles basic elements
-        # A full implementation would need to parse the markdown AST
-        blocks = []
-        lines = markdown_content.split('\n')
-        
-        i = 0
-        while i < len(lines):
-            line = lines[i].strip()
-            
-            # Skip empty lines
-            if not line:
-                i += 1
-                continue
-                
-            # Headings
-            heading_match = re.match(r'^(#{1,3})\s+(.+)$', line)
-            if heading_match:
-                level = len(heading_match.group(1))
-                text = heading_match.group(2)
-                blocks.append(self._create_heading_block(text, level))
-                i += 1
-                continue
-                
-            # Code blocks
-            if line.startswith('```'):
-                language = line[3:].strip()
-                code_lines = []
-                i += 1
-                while i < len(lines) and not lines[i].strip().startswith('```'):
-                    code_lines.append(lines[i])
-                    i += 1
-                # Skip closing ```
-                i += 1
-                blocks.append(self._create_code_block('\n'.join(code_lines), language))
-                continue
-                
-            # Bullet lists
-            if line.startswith('- ') or line.startswith('* '):
-                text = line[2:].strip()
-                blocks.append(self._create_bullet_list_item(text))
-                i += 1
-                continue
-                
-            # Numbered lists
-            numbered_match = re.match(r'^\d+\.\s+(.+)$', line)
-            if numbered_match:
-                text = numbered_match.group(1)
-                blocks.append(self._create_numbered_list_item(text))
-                i += 1
-                continue
-                
-            # Quotes
-            if line.startswith('> '):
-                text = line[2:].strip()
-                blocks.append(self._create_quote_block(text))
-                i += 1
-                continue
-                
-            # Paragraphs (default)
-            blocks.append(self._create_paragraph_block(line))
-            i += 1
-                
-        return blocks
+        # Scanning and building are separate passes; the build pass is one
+        # comprehension with no per-block branching beyond code blocks
+        make_block = _make_block
+        make_code_block = _make_code_block
+        return [
+            make_block(block_type, text) if language is None else make_code_block(text, language)
+            for block_type, text, language in _scan_blocks(markdown_content)
+        ]
 
-    def blocks_to_markdown(self, blocks: List[Dict[str, Any]]) -> str:
+    def blocks_to_markdown(self, blocks: Iterable[Dict[str, Any]]) -> str:
         """
         Convert Notion blocks to markdown content.
 
+        Blocks are rendered one at a time, so a generator such as
+        NotionClient.iter_page_blocks is consumed as its results arrive.
+
         Args:
-            blocks: List of Notion block objects.
+            blocks: Notion block objects, as a list or any other iterable.
 
         Returns:
             Markdown content.
         """
         # This is a simplified implementation
-        markdown_lines = []
+        buf = io.StringIO()
+        # Bind per-block lookups to locals once, outside the loop
+        write = buf.write
+        get_renderer = self._RENDERERS.get
         
         for block in blocks:
-            block_type = block.get('type')
-            
-            if block_type in ['heading_1', 'heading_2', 'heading_3']:
-                level = int(block_type[-1])
-                text = self._get_text_from_rich_text(block[block_type].get('rich_text', []))
-                markdown_lines.append(f"{'#' * level} {text}")
-                
-            elif block_type == 'paragraph':
-                text = self._get_text_from_rich_text(block['paragraph'].get('rich_text', []))
-                markdown_lines.append(text)
-                
-            elif block_type == 'code':
-                text = self._get_text_from_rich_text(block['code'].get('rich_text', []))
-                language = block['code'].get('language', '')
-                markdown_lines.append(f"```{language}")
-                markdown_lines.append(text)
-                markdown_lines.append("```")
-                
-            elif block_type == 'quote':
-                text = self._get_text_from_rich_text(block['quote'].get('rich_text', []))
-                markdown_lines.append(f"> {text}")
-                
-            elif block_type == 'bulleted_list_item':
-                text = self._get_text_from_rich_text(block['bulleted_list_item'].get('rich_text', []))
-                markdown_lines.append(f"- {text}")
-                
-            elif block_type == 'numbered_list_item':
-                text = self._get_text_from_rich_text(block['numbered_list_item'].get('rich_text', []))
-                markdown_lines.append(f"1. {text}")
+            renderer = get_renderer(block.get('type'))
+            if renderer:
+                renderer(self, block, buf)
                 
             # Add a blank line after each block
-            markdown_lines.append("")
+            write("\n")
             
-        return '\n'.join(markdown_lines)
-
-    def _create_heading_block(self, text: str, level: int) -> Dict[str, Any]:
-        """Create a heading block."""
-        if level > 3:
-            level = 3  # Notion only supports h1-h3
-        block_type = f"heading_{level}"
-        return {
-            "type": block_type,
-            block_type: {
-                "rich_text": [
-                    {
-                        "type": "text",
-                        "text": {
-                            "content": text
-                        }
-                    }
-                ]
-            }
-        }
-
-    def _create_paragraph_block(self, text: str) -> Dict[str, Any]:
-        """Create a paragraph block."""
-        return {
-            "type": "paragraph",
-            "paragraph": {
-                "rich_text": [
-                    {
-                        "type": "text",
-                        "text": {
-                            "content": text
-                        }
-                    }
-                ]
-            }
-        }
-
-    def _create_code_block(self, code: str, language: str = "") -> Dict[str, Any]:
-        """Create a code block."""
-        return {
-            "type": "code",
-            "code": {
-                "rich_text": [
-                    {
-                        "type": "text",
-                        "text": {
-                            "content": code
-                        }
-                    }
-                ],
-                "language": language
-            }
-        }
-
-    def _create_quote_block(self, text: str) -> Dict[str, Any]:
-        """Create a quote block."""
-        return {
-            "type": "quote",
-            "quote": {
-                "rich_text": [
-                    {
-                        "type": "text",
-                        "text": {
-                            "content": text
-                        }
-                    }
-                ]
-            }
-        }
-
-    def _create_bullet_list_item(self, text: str) -> Dict[str, Any]:
-        """Create a bulleted list item."""
-        return {
-            "type": "bulleted_list_item",
-            "bulleted_list_item": {
-                "rich_text": [
-                    {
-                        "type": "text",
-                        "text": {
-                            "content": text
-                        }
-                    }
-                ]
-            }
-        }
-
-    def _create_numbered_list_item(self, text: str) -> Dict[str, Any]:
-        """Create a numbered list item."""
-        return {
-            "type": "numbered_list_item",
-            "numbered_list_item": {
-                "rich_text": [
-                    {
-                        "type": "text",
-                        "text": {
-                            "content": text
-                        }
-                    }
-                ]
-            }
-        }
+        # Every line is newline-terminated; drop the final terminator so the
+        # output matches joining the lines with newlines
+        return buf.getvalue()[:-1]
 
     def _get_text_from_rich_text(self, rich_text: List[Dict[str, Any]]) -> str:
         """Extract plain text from rich text array."""
-        return ''.join(item.get('text', {}).get('content', '') for item in rich_text)
\ No newline at end of file
+        try:
+            return ''.join([item['text']['content'] for item in rich_text])
+        except (KeyError, TypeError):
+            # Mentions and equations carry no text object
+            return ''.join([item.get('text', {}).get('content', '') for item in rich_text])
+
+    def _render_heading(self, block: Dict[str, Any], buf: io.StringIO) -> None:
+        """Render a heading block."""
+        block_type = block['type']
+        hashes = _HASHES[int(block_type[-1]) - 1]
+        text = self._get_text_from_rich_text(block[block_type].get('rich_text', []))
+        buf.write(f"{hashes} {text}\n")
+
+    def _render_paragraph(self, block: Dict[str, Any], buf: io.StringIO) -> None:
+        """Render a paragraph block."""
+        buf.write(self._get_text_from_rich_text(block['paragraph'].get('rich_text', [])))
+        buf.write("\n")
+
+    def _render_code(self, block: Dict[str, Any], buf: io.StringIO) -> None:
+        """Render a code block."""
+        text = self._get_text_from_rich_text(block['code'].get('rich_text', []))
+        language = block['code'].get('language', '')
+        buf.write(f"```{language}\n{text}\n```\n")
+
+    def _render_quote(self, block: Dict[str, Any], buf: io.StringIO) -> None:
+        """Render a quote block."""
+        text = self._get_text_from_rich_text(block['quote'].get('rich_text', []))
+        buf.write(f"> {text}\n")
+
+    def _render_bullet(self, block: Dict[str, Any], buf: io.StringIO) -> None:
+        """Render a bulleted list item."""
+        text = self._get_text_from_rich_text(block['bulleted_list_item'].get('rich_text', []))
+        buf.write(f"- {text}\n")
+
+    def _render_numbered(self, block: Dict[str, Any], buf: io.StringIO) -> None:
+        """Render a numbered list item."""
+        text = self._get_text_from_rich_text(block['numbered_list_item'].get('rich_text', []))
+        buf.write(f"1. {text}\n")
+
+    # Markdown renderer for each supported Notion block type
+    _RENDERERS = {
+        'heading_1': _render_heading,
+        'heading_2': _render_heading,
+        'heading_3': _render_heading,
+        'paragraph': _render_paragraph,
+        'code': _render_code,
+        'quote': _render_quote,
+        'bulleted_list_item': _render_bullet,
+        'numbered_list_item': _render_numbered,
+    }
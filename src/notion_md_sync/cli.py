@@ -5,7 +5,10 @@ Command-line interface for Notion Markdown Sync.
 import click
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from .config import Config
+from .rate_limiter import RateLimiter
+from .utils import format_notion_id, iter_markdown_files, page_title, sanitize_filename
 
 
 @click.group()
@@ -17,6 +20,8 @@ def cli(ctx, debug, config):
     ctx.ensure_object(dict)
     ctx.obj["DEBUG"] = debug
     ctx.obj["CONFIG"] = Config(config)
+    # One bucket for every Notion request made by this invocation
+    ctx.obj["RATE_LIMITER"] = RateLimiter()
 
 
 @cli.command()
@@ -33,13 +38,23 @@ def init(ctx, config):
             return
 
     # Create basic config structure
-    config_obj.set("notion.token", "")
-    config_obj.set("notion.parent_page_id", "")
-    config_obj.set("sync.direction", "markdown_to_notion")
-    config_obj.set("sync.conflict_resolution", "newer")
-    config_obj.set("directories.markdown_root", "./docs")
-    config_obj.set("directories.excluded_patterns", ["*.tmp", "node_modules/**"])
-    config_obj.set("mapping.strategy", "frontmatter")
+    config_obj.config_data.update({
+        "notion": {
+            "token": "",
+            "parent_page_id": "",
+        },
+        "sync": {
+            "direction": "markdown_to_notion",
+            "conflict_resolution": "newer",
+        },
+        "directories": {
+            "markdown_root": "./docs",
+            "excluded_patterns": ["*.tmp", "node_modules/**"],
+        },
+        "mapping": {
+            "strategy": "frontmatter",
+        },
+    })
 
     config_obj.save()
     click.echo(f"Created configuration file at {config_obj.config_path}")
@@ -75,7 +90,7 @@ def sync(ctx, file, direction):
     
     # Initialize sync engine
     from .sync_engine import SyncEngine
-    sync_engine = SyncEngine(config)
+    sync_engine = SyncEngine(config, rate_limiter=ctx.obj["RATE_LIMITER"])
     
     # Perform the sync based on direction
     if direction == 'push':
@@ -83,8 +98,6 @@ def sync(ctx, file, direction):
         success, message = sync_engine.sync_file_to_notion(file)
     else:  # pull
         # For pull, we need to get the Notion page ID from the frontmatter
-        from .markdown_parser import MarkdownParser
-        
         if not os.path.exists(file) or not os.path.isfile(file):
             # For pull, if the file doesn't exist, we'll create it
             if not click.confirm(f"File {file} doesn't exist. Create it?"):
@@ -98,8 +111,7 @@ def sync(ctx, file, direction):
         else:
             # File exists, try to get notion_page_id from frontmatter
             try:
-                parser = MarkdownParser()
-                metadata, _, _ = parser.parse_file(file)
+                metadata = sync_engine.markdown_parser.parse_frontmatter_only(file)
                 notion_page_id = metadata.get("notion_page_id")
                 
                 if not notion_page_id:
@@ -120,17 +132,19 @@ def sync(ctx, file, direction):
 
 @cli.command()
 @click.option("-q", "--query", default="", help="Search query for Notion pages (empty = all accessible pages)")
-@click.option("--dir", "--directory", default=None, help="Directory to save pulled markdown files")
-@click.option("--dr", "--dry-run", is_flag=True, help="Show pages that would be pulled without actually pulling")
+@click.option("--dir", "--directory", "directory", default=None, help="Directory to save pulled markdown files")
+@click.option("--dr", "--dry-run", "dry_run", is_flag=True, help="Show pages that would be pulled without actually pulling")
 @click.option("-y", "--yes", is_flag=True, help="Skip confirmation prompts")
+@click.option("-j", "--jobs", type=click.IntRange(min=1), default=None,
+              help="Number of pages/files to sync at once (defaults to config's sync.concurrency)")
 @click.pass_context
-def pull_workspace(ctx, query, directory, dry_run, yes):
+def pull_workspace(ctx, query, directory, dry_run, yes, jobs):
     """Discover and pull pages from Notion workspace."""
     config = ctx.obj['CONFIG']
     
     # Initialize sync engine
     from .sync_engine import SyncEngine
-    sync_engine = SyncEngine(config)
+    sync_engine = SyncEngine(config, rate_limiter=ctx.obj["RATE_LIMITER"])
     
     # Set directory for pulled files
     if directory:
@@ -152,12 +166,13 @@ def pull_workspace(ctx, query, directory, dry_run, yes):
         
         click.echo(f"Found {len(pages)} page(s) in your Notion workspace:")
         
+        # Resolve final file names up front so dry runs show them too
+        pull_jobs = _plan_pulls(pages, pull_directory)
+        
         if dry_run:
             click.echo("Dry run - the following pages would be pulled:")
-            for page in pages:
-                title = page.get("properties", {}).get("title", {}).get("title", [{}])[0].get("text", {}).get("content", "Untitled")
-                page_id = page.get("id", "")
-                click.echo(f"  {title} (ID: {page_id})")
+            for page_id, title, file_path in pull_jobs:
+                click.echo(f"  {title} (ID: {page_id}) -> {file_path}")
             return
         
         # Confirm with user
@@ -166,40 +181,10 @@ def pull_workspace(ctx, query, directory, dry_run, yes):
             return
         
         # Pull each page
-        success_count = 0
-        failure_count = 0
-        
-        with click.progressbar(pages, label="Pulling pages from Notion") as page_list:
-            for page in page_list:
-                page_id = page.get("id", "")
-                title = page.get("properties", {}).get("title", {}).get("title", [{}])[0].get("text", {}).get("content", "Untitled")
-                
-                # Create filename from title
-                filename = "".join([c if c.isalnum() or c in [' ', '-', '_'] else '' for c in title])
-                filename = filename.replace(' ', '-').lower()
-                if not filename:
-                    filename = f"untitled-{page_id[:8]}"
-                
-                file_path = os.path.join(pull_directory, f"{filename}.md")
-                
-                # Handle duplicate filenames
-                counter = 1
-                original_file_path = file_path
-                while os.path.exists(file_path):
-                    name, ext = os.path.splitext(original_file_path)
-                    file_path = f"{name}-{counter}{ext}"
-                    counter += 1
-                
-                try:
-                    success, message = sync_engine.sync_notion_to_file(page_id, file_path)
-                    if success:
-                        success_count += 1
-                    else:
-                        failure_count += 1
-                        click.echo(f"\nFailed to pull '{title}': {message}")
-                except Exception as e:
-                    failure_count += 1
-                    click.echo(f"\nError pulling '{title}': {str(e)}")
+        success_count, failure_count = _pull_pages_concurrently(
+            pull_jobs, sync_engine, "Pulling pages from Notion",
+            concurrency=_get_concurrency(config, jobs, PULL_CONCURRENCY)
+        )
         
         # Show results
         click.echo(f"\nPull completed:")
@@ -213,18 +198,20 @@ def pull_workspace(ctx, query, directory, dry_run, yes):
 
 
 @cli.command()
-@click.option("--pid", "--parent-id", required=True, help="Notion page ID to pull child pages from")
-@click.option("--dir", "--directory", default=None, help="Directory to save pulled markdown files")
-@click.option("--dr", "--dry-run", is_flag=True, help="Show pages that would be pulled without actually pulling")
+@click.option("--pid", "--parent-id", "parent_id", required=True, help="Notion page ID to pull child pages from")
+@click.option("--dir", "--directory", "directory", default=None, help="Directory to save pulled markdown files")
+@click.option("--dr", "--dry-run", "dry_run", is_flag=True, help="Show pages that would be pulled without actually pulling")
 @click.option("-y", "--yes", is_flag=True, help="Skip confirmation prompts")
+@click.option("-j", "--jobs", type=click.IntRange(min=1), default=None,
+              help="Number of pages/files to sync at once (defaults to config's sync.concurrency)")
 @click.pass_context
-def pull_children(ctx, parent_id, directory, dry_run, yes):
+def pull_children(ctx, parent_id, directory, dry_run, yes, jobs):
     """Pull all child pages from a specific Notion parent page."""
     config = ctx.obj['CONFIG']
     
     # Initialize sync engine
     from .sync_engine import SyncEngine
-    sync_engine = SyncEngine(config)
+    sync_engine = SyncEngine(config, rate_limiter=ctx.obj["RATE_LIMITER"])
     
     # Set directory for pulled files
     if directory:
@@ -238,7 +225,7 @@ def pull_children(ctx, parent_id, directory, dry_run, yes):
         # First get the parent page to show its title
         try:
             parent_page = sync_engine.notion_client.get_page(parent_id)
-            parent_title = parent_page.get("properties", {}).get("title", {}).get("title", [{}])[0].get("text", {}).get("content", "Unknown")
+            parent_title = page_title(parent_page, "Unknown")
             click.echo(f"Getting child pages from: {parent_title}")
         except Exception as e:
             click.echo(f"Warning: Could not access parent page {parent_id}: {str(e)}")
@@ -253,12 +240,13 @@ def pull_children(ctx, parent_id, directory, dry_run, yes):
         
         click.echo(f"Found {len(child_pages)} child page(s):")
         
+        # Resolve final file names up front so dry runs show them too
+        pull_jobs = _plan_pulls(child_pages, pull_directory)
+        
         if dry_run:
             click.echo("Dry run - the following child pages would be pulled:")
-            for page in child_pages:
-                title = page.get("properties", {}).get("title", {}).get("title", [{}])[0].get("text", {}).get("content", "Untitled")
-                page_id = page.get("id", "")
-                click.echo(f"  {title} (ID: {page_id})")
+            for page_id, title, file_path in pull_jobs:
+                click.echo(f"  {title} (ID: {page_id}) -> {file_path}")
             return
         
         # Confirm with user
@@ -267,40 +255,10 @@ def pull_children(ctx, parent_id, directory, dry_run, yes):
             return
         
         # Pull each child page
-        success_count = 0
-        failure_count = 0
-        
-        with click.progressbar(child_pages, label="Pulling child pages from Notion") as page_list:
-            for page in page_list:
-                page_id = page.get("id", "")
-                title = page.get("properties", {}).get("title", {}).get("title", [{}])[0].get("text", {}).get("content", "Untitled")
-                
-                # Create filename from title
-                filename = "".join([c if c.isalnum() or c in [' ', '-', '_'] else '' for c in title])
-                filename = filename.replace(' ', '-').lower()
-                if not filename:
-                    filename = f"untitled-{page_id[:8]}"
-                
-                file_path = os.path.join(pull_directory, f"{filename}.md")
-                
-                # Handle duplicate filenames
-                counter = 1
-                original_file_path = file_path
-                while os.path.exists(file_path):
-                    name, ext = os.path.splitext(original_file_path)
-                    file_path = f"{name}-{counter}{ext}"
-                    counter += 1
-                
-                try:
-                    success, message = sync_engine.sync_notion_to_file(page_id, file_path)
-                    if success:
-                        success_count += 1
-                    else:
-                        failure_count += 1
-                        click.echo(f"\nFailed to pull '{title}': {message}")
-                except Exception as e:
-                    failure_count += 1
-                    click.echo(f"\nError pulling '{title}': {str(e)}")
+        success_count, failure_count = _pull_pages_concurrently(
+            pull_jobs, sync_engine, "Pulling child pages from Notion",
+            concurrency=_get_concurrency(config, jobs, PULL_CONCURRENCY)
+        )
         
         # Show results
         click.echo(f"\nPull completed:")
@@ -314,12 +272,14 @@ def pull_children(ctx, parent_id, directory, dry_run, yes):
 
 
 @cli.command()
-@click.option("--dir", "--directory", default=None, help="Directory containing markdown files to sync (defaults to config's markdown_root)")
-@click.option("--dr", "--dry-run", is_flag=True, help="Show files that would be synced without actually syncing")
+@click.option("--dir", "--directory", "directory", default=None, help="Directory containing markdown files to sync (defaults to config's markdown_root)")
+@click.option("--dr", "--dry-run", "dry_run", is_flag=True, help="Show files that would be synced without actually syncing")
 @click.option("-d", "--direction", type=click.Choice(['push', 'pull']), default='push',
               help="Sync direction: push (markdown to Notion) or pull (Notion to markdown)")
+@click.option("-j", "--jobs", type=click.IntRange(min=1), default=None,
+              help="Number of pages/files to sync at once (defaults to config's sync.concurrency)")
 @click.pass_context
-def sync_all(ctx, directory, dry_run, direction):
+def sync_all(ctx, directory, dry_run, direction, jobs):
     """Sync all markdown files with Notion (recommended)."""
     config = ctx.obj["CONFIG"]
     
@@ -345,15 +305,12 @@ def sync_all(ctx, directory, dry_run, direction):
         sys.exit(1)
     
     # Initialize sync engine
-    from .sync_engine import SyncEngine
-    sync_engine = SyncEngine(config)
+    from .sync_engine import SYNC_CONCURRENCY, SyncEngine
+    sync_engine = SyncEngine(config, rate_limiter=ctx.obj["RATE_LIMITER"])
     
     # Find all markdown files in the directory
-    markdown_files = []
-    for root, _, files in os.walk(markdown_dir):
-        for file in files:
-            if file.lower().endswith(('.md', '.markdown')):
-                markdown_files.append(os.path.join(root, file))
+    excluded_patterns = config.get("directories.excluded_patterns", [])
+    markdown_files = list(iter_markdown_files(markdown_dir, excluded_patterns))
     
     if not markdown_files:
         click.echo(f"No markdown files found in {markdown_dir}")
@@ -377,53 +334,31 @@ def sync_all(ctx, directory, dry_run, direction):
         click.echo("Sync cancelled.")
         return
     
-    # Perform the sync
+    # Perform the sync; workers report back and counting happens here
     success_count = 0
     failure_count = 0
     skipped_count = 0
-    
-    with click.progressbar(markdown_files, label=f"{action} Notion") as files:
-        for file in files:
-            try:
-                if direction == "push":
-                    success, message = sync_engine.sync_file_to_notion(file)
-                else:  # pull
-                    # Get notion_page_id from frontmatter
-                    try:
-                        from .markdown_parser import MarkdownParser
-                        parser = MarkdownParser()
-                        
-                        if os.path.exists(file):
-                            metadata, _, _ = parser.parse_file(file)
-                            notion_page_id = metadata.get("notion_page_id")
-                            
-                            if notion_page_id:
-                                success, message = sync_engine.sync_notion_to_file(notion_page_id, file)
-                                if success:
-                                    success_count += 1
-                                else:
-                                    failure_count += 1
-                                    click.echo(f"\nFailed to pull {file}: {message}")
-                            else:
-                                # Skip files without notion_page_id when pulling
-                                skipped_count += 1
-                                click.echo(f"\nSkipped {file}: No notion_page_id in frontmatter")
-                        else:
-                            # Skip files that don't exist when pulling
-                            skipped_count += 1
-                    except Exception as e:
-                        failure_count += 1
-                        click.echo(f"\nError reading {file}: {str(e)}")
-                        continue
-                
-                if direction == "push" and success:
-                    success_count += 1
-                elif direction == "push" and not success:
-                    failure_count += 1
-                    click.echo(f"\nFailed to push {file}: {message}")
-            except Exception as e:
+    concurrency = _get_concurrency(config, jobs, SYNC_CONCURRENCY)
+    messages = []
+    if direction == "push":
+        results = _push_files(markdown_files, sync_engine, concurrency)
+    else:  # pull
+        results = _pull_files(markdown_files, sync_engine, concurrency)
+    
+    with click.progressbar(length=len(markdown_files), label=f"{action} Notion") as bar:
+        for status, message in results:
+            if status == "success":
+                success_count += 1
+            elif status == "skipped":
+                skipped_count += 1
+            else:
                 failure_count += 1
-                click.echo(f"\nError syncing {file}: {str(e)}")
+            if message:
+                messages.append(message)
+            bar.update(1)
+    
+    # Printed after the progress bar so it isn't redrawn between messages
+    _echo_messages(messages)
     
     # Display summary
     click.echo(f"\nSync complete: {success_count} succeeded, {failure_count} failed, {skipped_count} skipped")
@@ -443,11 +378,22 @@ def watch(ctx, daemon, direction):
 
     # Initialize sync engine
     from .sync_engine import SyncEngine
-    sync_engine = SyncEngine(config)
+    sync_engine = SyncEngine(config, rate_limiter=ctx.obj["RATE_LIMITER"])
+    parser = sync_engine.markdown_parser
+    watch_dir = config.get("directories.markdown_root", "./docs")
+    
+    # Skip files whose bytes are the same as after their last sync, also
+    # across restarts of the watcher
+    from .digest_store import DigestStore, file_digest
+    synced_digests = DigestStore.for_directory(watch_dir)
     
     # Define callback for file changes based on direction
     def on_file_change(file_path):
+        if synced_digests.is_unchanged(file_path, file_digest(file_path)):
+            return
+        
         click.echo(f"File changed: {file_path}")
+        synced = True
         
         if direction in ['push', 'both']:
             # Sync from markdown to Notion
@@ -457,15 +403,13 @@ def watch(ctx, daemon, direction):
                 click.echo(f"Push succeeded: {message}")
             else:
                 click.echo(f"Push failed: {message}")
+                synced = False
         
         if direction in ['pull', 'both']:
             # For pull, we need the notion_page_id from frontmatter
             try:
-                from .markdown_parser import MarkdownParser
-                parser = MarkdownParser()
-                
                 if os.path.exists(file_path):
-                    metadata, _, _ = parser.parse_file(file_path)
+                    metadata = parser.parse_frontmatter_only(file_path)
                     notion_page_id = metadata.get("notion_page_id")
                     
                     if notion_page_id:
@@ -475,16 +419,23 @@ def watch(ctx, daemon, direction):
                             click.echo(f"Pull succeeded: {message}")
                         else:
                             click.echo(f"Pull failed: {message}")
+                            synced = False
                     else:
                         click.echo(f"Skipped pulling: No notion_page_id in frontmatter for {file_path}")
                 else:
                     click.echo(f"Skipped pulling: File {file_path} does not exist")
             except Exception as e:
                 click.echo(f"Error during pull: {str(e)}")
+                synced = False
+        
+        # Remember the file as we left it, including our own frontmatter
+        # update, so the events caused by that write don't sync it again.
+        # After a failure the old digest stays, so the next event retries.
+        if synced:
+            synced_digests.record(file_path, file_digest(file_path))
     
     # Initialize file watcher
     from .file_watcher import FileWatcher
-    watch_dir = config.get("directories.markdown_root", "./docs")
     
     direction_text = "both directions" if direction == "both" else f"{direction} direction"
     click.echo(f"Starting file watcher for directory: {watch_dir} in {direction_text}")
@@ -519,18 +470,21 @@ def verify(ctx, create_test_page):
     click.echo("Verifying Notion API connection...")
     
     # Format parent_id with dashes if needed
-    if len(parent_id) == 32 and "-" not in parent_id:
-        formatted_id = f"{parent_id[0:8]}-{parent_id[8:12]}-{parent_id[12:16]}-{parent_id[16:20]}-{parent_id[20:]}"
+    try:
+        formatted_id = format_notion_id(parent_id)
+    except ValueError:
+        click.echo(f"Error: Notion parent page ID {parent_id} is not a valid page ID.")
+        click.echo("Use the 32-character ID at the end of the page's URL.")
+        sys.exit(1)
+    if formatted_id != parent_id:
         click.echo(f"Formatted page ID: {formatted_id}")
-    else:
-        formatted_id = parent_id
         
     # Try to access the API
-    from notion_client import Client
-    from notion_client.errors import APIResponseError
-    
     try:
-        client = Client(auth=token)
+        from notion_client.errors import APIResponseError
+        from .notion_client import get_client
+        
+        client = get_client(token)
         
         # Test basic API access
         user = client.users.me()
@@ -587,8 +541,7 @@ def verify(ctx, create_test_page):
         else:
             try:
                 # Format the temp parent ID if needed
-                if len(temp_parent_id) == 32 and "-" not in temp_parent_id:
-                    temp_parent_id = f"{temp_parent_id[0:8]}-{temp_parent_id[8:12]}-{temp_parent_id[12:16]}-{temp_parent_id[16:20]}-{temp_parent_id[20:]}"
+                temp_parent_id = format_notion_id(temp_parent_id)
                     
                 click.echo(f"Using parent page ID: {temp_parent_id}")
                     
@@ -636,9 +589,238 @@ def verify(ctx, create_test_page):
     click.echo("\n✅ Notion setup verified successfully!")
 
 
+# Number of pages pulled at once; Notion allows about 3 requests per second
+PULL_CONCURRENCY = 3
+
+
+def _get_concurrency(config, jobs, default):
+    """
+    Resolve how many pages or files a command works on at once.
+
+    Args:
+        config: Application configuration.
+        jobs: Value of the --jobs option, or None if not given.
+        default: Command's default when neither --jobs nor
+            sync.concurrency is set.
+
+    Returns:
+        Number of worker threads to use.
+
+    Raises:
+        click.BadParameter: If sync.concurrency is not a whole number.
+    """
+    if jobs:
+        return jobs
+    value = config.get("sync.concurrency", default)
+    try:
+        return max(1, int(value))
+    except (TypeError, ValueError):
+        raise click.BadParameter(f"expected a whole number, got {value!r}", param_hint="sync.concurrency")
+
+
+def _unique_filename(existing, base, ext):
+    """
+    Pick a file name that is not taken yet and reserve it.
+
+    Args:
+        existing: Set of names already present in the target directory;
+            the chosen name is added to it.
+        base: File name without extension.
+        ext: File extension, including the dot.
+
+    Returns:
+        The first free name out of base, base-1, base-2, ... with ext appended.
+    """
+    candidate = f"{base}{ext}"
+    counter = 1
+    while candidate in existing:
+        candidate = f"{base}-{counter}{ext}"
+        counter += 1
+    existing.add(candidate)
+    return candidate
+
+
+def _echo_messages(messages):
+    """
+    Print the per-item messages collected while a progress bar was shown.
+
+    Args:
+        messages: Lines to print, in completion order.
+    """
+    if messages:
+        click.echo("\n".join(messages))
+
+
+def _plan_pulls(pages, pull_directory):
+    """
+    Decide which file each pulled Notion page is written to.
+
+    All names are resolved in one pass before any worker starts, so workers
+    never race each other on the same file name.
+
+    Args:
+        pages: Page objects returned by the Notion API.
+        pull_directory: Directory to save the markdown files in.
+
+    Returns:
+        List of (page_id, title, file_path) tuples.
+    """
+    jobs = []
+    # One directory listing instead of a stat per candidate name
+    existing = {entry.name for entry in os.scandir(pull_directory)}
+    for page in pages:
+        page_id = page.get("id", "")
+        title = page_title(page)
+        
+        # Create filename from title
+        filename = sanitize_filename(title)
+        if not filename:
+            filename = f"untitled-{page_id[:8]}"
+        
+        # Handle duplicate filenames, including ones claimed earlier in this pull
+        file_path = os.path.join(pull_directory, _unique_filename(existing, filename, ".md"))
+        
+        jobs.append((page_id, title, file_path))
+    
+    return jobs
+
+
+def _pull_pages_concurrently(jobs, sync_engine, label, concurrency=PULL_CONCURRENCY):
+    """
+    Pull Notion pages to markdown files using a pool of worker threads.
+
+    Args:
+        jobs: (page_id, title, file_path) tuples from _plan_pulls.
+        sync_engine: SyncEngine used to pull each page.
+        label: Progress bar label.
+        concurrency: Maximum number of pages pulled at the same time.
+
+    Returns:
+        Tuple of (success_count, failure_count)
+    """
+    success_count = 0
+    failure_count = 0
+    messages = []
+    
+    # Pulls are network bound, so threads overlap the Notion round-trips
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = {
+            executor.submit(sync_engine.sync_notion_to_file, page_id, file_path): title
+            for page_id, title, file_path in jobs
+        }
+        with click.progressbar(length=len(futures), label=label) as bar:
+            for future in as_completed(futures):
+                title = futures[future]
+                try:
+                    success, message = future.result()
+                    if success:
+                        success_count += 1
+                    else:
+                        failure_count += 1
+                        messages.append(f"Failed to pull '{title}': {message}")
+                except Exception as e:
+                    failure_count += 1
+                    messages.append(f"Error pulling '{title}': {str(e)}")
+                bar.update(1)
+    
+    # Printed after the progress bar so it isn't redrawn between messages
+    _echo_messages(messages)
+    
+    return success_count, failure_count
+
+
+def _push_files(files, sync_engine, concurrency):
+    """
+    Push markdown files to Notion for sync-all.
+
+    Args:
+        files: Paths to markdown files.
+        sync_engine: SyncEngine used to sync the files.
+        concurrency: Maximum number of files pushed at the same time.
+
+    Returns:
+        Iterator over (status, message) tuples in completion order, where
+        status is "success" or "failure" and message is a line to show the
+        user, or None.
+    """
+    for file, success, message in sync_engine.sync_files_to_notion(files, concurrency):
+        if success:
+            yield "success", None
+        else:
+            yield "failure", f"Failed to push {file}: {message}"
+
+
+def _pull_files(files, sync_engine, concurrency):
+    """
+    Pull markdown files from their linked Notion pages for sync-all.
+
+    Args:
+        files: Paths to markdown files.
+        sync_engine: SyncEngine used to sync the files.
+        concurrency: Maximum number of files pulled at the same time.
+
+    Returns:
+        Iterator over (status, message) tuples in completion order, as
+        returned by _pull_one.
+    """
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = [
+            executor.submit(_pull_one, file, sync_engine, sync_engine.markdown_parser)
+            for file in files
+        ]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def _pull_one(file, sync_engine, parser):
+    """
+    Pull a single markdown file from its linked Notion page for sync-all.
+
+    Runs on a worker thread, so it only reports what happened and leaves
+    counting and output to the caller.
+
+    Args:
+        file: Path to markdown file.
+        sync_engine: SyncEngine used to sync the file.
+        parser: MarkdownParser used to read the file's frontmatter.
+
+    Returns:
+        Tuple of (status, message) where status is "success", "failure" or
+        "skipped" and message is a line to show the user, or None.
+    """
+    try:
+        # Get notion_page_id from frontmatter
+        try:
+            if not os.path.exists(file):
+                # Skip files that don't exist when pulling
+                return "skipped", None
+            
+            metadata = parser.parse_frontmatter_only(file)
+            notion_page_id = metadata.get("notion_page_id")
+            
+            if not notion_page_id:
+                # Skip files without notion_page_id when pulling
+                return "skipped", f"Skipped {file}: No notion_page_id in frontmatter"
+        except Exception as e:
+            return "failure", f"Error reading {file}: {str(e)}"
+        
+        success, message = sync_engine.sync_notion_to_file(notion_page_id, file)
+        if success:
+            return "success", None
+        return "failure", f"Failed to pull {file}: {message}"
+    except Exception as e:
+        return "failure", f"Error syncing {file}: {str(e)}"
+
+
 def main():
     """Main entry point for the CLI."""
-    cli(obj={})
+    try:
+        cli(obj={})
+    finally:
+        # Only set up if a command talked to Notion
+        notion_client = sys.modules.get(__package__ + ".notion_client")
+        if notion_client is not None:
+            notion_client.close_clients()
 
 
 if __name__ == "__main__":
@@ -2,15 +2,37 @@
 Configuration management for Notion Markdown Sync.
 """
 
+import functools
 import os
 import yaml
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 from dotenv import load_dotenv
 
+from .utils import atomic_write_text
+
+try:
+    from yaml import CSafeDumper as SafeDumper, CSafeLoader as SafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeDumper, SafeLoader
+
 # Load environment variables from .env file
 load_dotenv()
 
 
+@functools.lru_cache(maxsize=256)
+def _parse_key(key: str) -> Tuple[str, Tuple[str, ...]]:
+    """
+    Split a dotted configuration key.
+
+    Args:
+        key: Configuration key in dot notation.
+
+    Returns:
+        Tuple of (environment variable name, key path).
+    """
+    return key.replace(".", "_").upper(), tuple(key.split("."))
+
+
 class Config:
     """Configuration manager for the application."""
 
@@ -25,6 +47,7 @@ class Config:
         """
         self.config_path = config_path or self.DEFAULT_CONFIG_PATH
         self.config_data = {}
+        self.clear_env_cache()
         self.load()
 
     def load(self) -> Dict[str, Any]:
@@ -36,17 +59,24 @@ class Config:
         """
         try:
             with open(self.config_path, "r") as f:
-                self.config_data = yaml.safe_load(f) or {}
-            return self.config_data
+                self.config_data = yaml.load(f, Loader=SafeLoader) or {}
         except FileNotFoundError:
             self.config_data = {}
-            return self.config_data
+        return self.config_data
 
     def save(self) -> None:
-        """Save current configuration to file."""
-        os.makedirs(os.path.dirname(self.config_path), exist_ok=True)
-        with open(self.config_path, "w") as f:
-            yaml.dump(self.config_data, f, default_flow_style=False)
+        """
+        Save current configuration to file.
+
+        It is written to a temporary file first and then moved into place,
+        so an interrupted save never leaves a truncated config behind.
+        """
+        config_dir = os.path.dirname(self.config_path)
+        if config_dir:
+            os.makedirs(config_dir, exist_ok=True)
+
+        text = yaml.dump(self.config_data, Dumper=SafeDumper, default_flow_style=False)
+        atomic_write_text(self.config_path, text, fsync=True)
 
     def get(self, key: str, default: Any = None) -> Any:
         """
@@ -64,14 +94,14 @@ class Config:
         Returns:
             Configuration value or default.
         """
+        env_key, keys = _parse_key(key)
+        
         # First check environment variables (convert dot notation to uppercase with underscores)
-        env_key = key.replace(".", "_").upper()
-        env_value = os.environ.get(env_key)
+        env_value = self._env.get(env_key)
         if env_value is not None:
             return env_value
             
         # Then check configuration file
-        keys = key.split(".")
         data = self.config_data
         for k in keys:
             if not isinstance(data, dict) or k not in data:
@@ -79,6 +109,15 @@ class Config:
             data = data[k]
         return data
 
+    def clear_env_cache(self) -> None:
+        """
+        Re-read environment variable overrides.
+
+        Environment variables are captured when the configuration is
+        created; call this after changing os.environ to pick them up.
+        """
+        self._env = dict(os.environ)
+
     def set(self, key: str, value: Any) -> None:
         """
         Set configuration value.
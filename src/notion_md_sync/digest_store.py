@@ -0,0 +1,119 @@
+"""
+Persistent record of file contents as they were last synced.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from typing import Dict, Optional
+
+from .utils import atomic_write_text
+
+# Directory, inside the markdown root, where sync state is kept
+STATE_DIR = ".notion-md-sync"
+
+
+def file_digest(file_path: str) -> Optional[str]:
+    """
+    Hash a file's contents.
+
+    Args:
+        file_path: Path to the file.
+
+    Returns:
+        Hex BLAKE2b digest of the file, or None if it can't be read.
+    """
+    try:
+        with open(file_path, "rb") as f:
+            return hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+    except OSError:
+        return None
+
+
+class DigestStore:
+    """
+    Digests of synced files, kept on disk so they survive restarts.
+
+    Editors and file systems report many modifications that don't change a
+    file's bytes. Comparing a digest first lets those events skip the
+    Notion round trips entirely, also for the first event after the
+    watcher was restarted.
+    """
+
+    def __init__(self, store_path: str):
+        """
+        Initialize the store, loading previously recorded digests.
+
+        Args:
+            store_path: Path to the JSON file holding the digests.
+        """
+        self.store_path = store_path
+        self._digests: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self.load()
+
+    @classmethod
+    def for_directory(cls, markdown_root: str) -> "DigestStore":
+        """
+        Get the store kept in a markdown directory.
+
+        Args:
+            markdown_root: Root directory of the markdown files.
+
+        Returns:
+            Digest store for the directory.
+        """
+        return cls(os.path.join(markdown_root, STATE_DIR, "hashes.json"))
+
+    def load(self) -> None:
+        """Load digests from disk; a missing or unreadable store is empty."""
+        try:
+            with open(self.store_path, "r", encoding="utf-8") as f:
+                digests = json.load(f)
+        except (OSError, ValueError):
+            digests = {}
+        with self._lock:
+            self._digests = digests if isinstance(digests, dict) else {}
+
+    def is_unchanged(self, file_path: str, digest: Optional[str]) -> bool:
+        """
+        Check whether a file still has the contents it was last synced with.
+
+        Args:
+            file_path: Path to the file.
+            digest: Current digest of the file.
+
+        Returns:
+            True if the digest matches the recorded one, False otherwise.
+        """
+        if digest is None:
+            return False
+        with self._lock:
+            return self._digests.get(os.path.abspath(file_path)) == digest
+
+    def record(self, file_path: str, digest: Optional[str]) -> None:
+        """
+        Remember a file's digest and write the store to disk.
+
+        Only record a file after it synced successfully; a recorded digest
+        makes later events with the same contents skip the file, also
+        after a restart.
+
+        Args:
+            file_path: Path to the file.
+            digest: Digest of the file as synced.
+        """
+        if digest is None:
+            return
+        with self._lock:
+            self._digests[os.path.abspath(file_path)] = digest
+            self._save()
+
+    def _save(self) -> None:
+        """Write the digests atomically; failures only cost a re-sync later."""
+        try:
+            os.makedirs(os.path.dirname(self.store_path), exist_ok=True)
+            atomic_write_text(self.store_path, json.dumps(self._digests))
+        except OSError as e:
+            print(f"Warning: Could not save sync state to {self.store_path}: {str(e)}")
@@ -3,12 +3,23 @@ File system watcher for monitoring markdown file changes.
 """
 
 import os
+import re
+import threading
 import time
 from typing import Callable, List, Optional
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler, FileCreatedEvent, FileModifiedEvent
 
 from .config import Config
+from .utils import MARKDOWN_SUFFIXES, compile_exclusions, is_excluded
+
+# Characters that make a pattern more than a literal path
+_GLOB_CHARS = re.compile(r"[*?\[]")
+
+# Marks the end of an excluded directory prefix in the trie
+_TRIE_END = None
+
+_MARKDOWN_SUFFIX_SET = frozenset(MARKDOWN_SUFFIXES)
 
 
 class MarkdownFileEventHandler(FileSystemEventHandler):
@@ -27,8 +38,15 @@ class MarkdownFileEventHandler(FileSystemEventHandler):
         self.callback = callback
         self.config = config
         self.excluded_patterns = config.get("directories.excluded_patterns", [])
-        self._last_events = {}  # For debouncing
+        # Patterns are relative to the watched directory, like in sync-all
+        self._root = os.path.abspath(config.get("directories.markdown_root", "./docs"))
+        self._split_exclusions(self.excluded_patterns)
+        self._timers = {}  # For debouncing: pending callback per path
+        self._timers_lock = threading.Lock()
         self._debounce_seconds = 2
+        # Paths whose callback is running, and those changed again meanwhile
+        self._running = set()
+        self._rerun = set()
 
     def on_created(self, event):
         """Handle file created event."""
@@ -42,57 +60,126 @@ class MarkdownFileEventHandler(FileSystemEventHandler):
             if not self._is_excluded(event.src_path):
                 self._debounce_event(event.src_path)
 
+    def on_moved(self, event):
+        """Handle file moved event, e.g. an editor's atomic save."""
+        if not event.is_directory and self._is_markdown_file(event.dest_path):
+            if not self._is_excluded(event.dest_path):
+                self._debounce_event(event.dest_path)
+
     def _is_markdown_file(self, path: str) -> bool:
         """Check if a file is a markdown file."""
-        return path.lower().endswith(('.md', '.markdown'))
+        # Only lowercase the extension, not the whole path
+        return path[path.rfind('.'):].lower() in _MARKDOWN_SUFFIX_SET
+
+    def _split_exclusions(self, patterns: List[str]) -> None:
+        """
+        Sort excluded patterns into directory prefixes and everything else.
+
+        Plain directory patterns like ``node_modules/**`` or ``build/out/**``
+        are checked by looking up path components, which rejects a path in
+        O(depth) no matter how many of them are configured. All other
+        patterns are compiled into one regular expression.
+        """
+        dir_names = set()
+        dir_trie = {}
+        other_patterns = []
+        for pattern in patterns or []:
+            prefix = pattern[:-3] if pattern.endswith("/**") else ""
+            if not prefix or _GLOB_CHARS.search(prefix):
+                other_patterns.append(pattern)
+                continue
+            
+            parts = prefix.split("/")
+            if len(parts) == 1:
+                # A single directory name is excluded at any depth
+                dir_names.add(prefix)
+            else:
+                # Longer prefixes are anchored at the watched directory
+                node = dir_trie
+                for part in parts:
+                    node = node.setdefault(part, {})
+                node[_TRIE_END] = True
+        
+        self._excluded_dir_names = frozenset(dir_names)
+        self._excluded_dir_trie = dir_trie
+        self._excluded_re = compile_exclusions(other_patterns)
 
     def _is_excluded(self, path: str) -> bool:
         """Check if a path matches any excluded patterns."""
-        for pattern in self.excluded_patterns:
-            # Simple glob pattern matching
-            if pattern.endswith('/**'):
-                # Directory and all subdirectories
-                dir_pattern = pattern[:-3]
-                if path.startswith(dir_pattern):
-                    return True
-            elif pattern.startswith('*') and pattern.endswith('*'):
-                # Contains pattern
-                middle = pattern[1:-1]
-                if middle in path:
-                    return True
-            elif pattern.startswith('*'):
-                # Ends with pattern
-                suffix = pattern[1:]
-                if path.endswith(suffix):
-                    return True
-            elif pattern.endswith('*'):
-                # Starts with pattern
-                prefix = pattern[:-1]
-                if path.startswith(prefix):
-                    return True
-            elif pattern == path:
-                # Exact match
+        rel_path = os.path.relpath(os.path.abspath(path), self._root).replace(os.sep, "/")
+        dirs = rel_path.split("/")[:-1]
+        
+        if not self._excluded_dir_names.isdisjoint(dirs):
+            return True
+        
+        node = self._excluded_dir_trie
+        for part in dirs:
+            node = node.get(part)
+            if node is None:
+                break
+            if _TRIE_END in node:
                 return True
-        return False
+        
+        return is_excluded(self._excluded_re, rel_path)
 
     def _debounce_event(self, path: str):
         """
         Debounce file events to prevent multiple callbacks for the same change.
+
+        Each event (re)starts a timer for its path, so the callback runs once
+        the path has been quiet for the debounce period. The watchdog thread
+        never waits for it.
         """
-        current_time = time.time()
-        last_time = self._last_events.get(path, 0)
+        timer = threading.Timer(self._debounce_seconds, self._run_callback, args=(path,))
+        timer.daemon = True
         
-        self._last_events[path] = current_time
+        with self._timers_lock:
+            previous = self._timers.get(path)
+            if previous:
+                previous.cancel()
+            self._timers[path] = timer
         
-        # If enough time has passed since the last event, process it
-        if current_time - last_time > self._debounce_seconds:
-            # Schedule the callback to run after debounce period
-            # In a real implementation, we might use a proper job queue
-            time.sleep(self._debounce_seconds)
-            
-            # Check if this is still the most recent event
-            if self._last_events.get(path) == current_time:
+        timer.start()
+
+    def _run_callback(self, path: str):
+        """
+        Run the callback for a path whose debounce timer expired.
+
+        A sync can take longer than the debounce period, so a path may
+        expire again while its callback is still running. Instead of
+        syncing the same file twice at once, the running callback is
+        repeated once it finishes, however many times the path expired
+        in the meantime.
+        """
+        with self._timers_lock:
+            if self._timers.get(path) is threading.current_thread():
+                del self._timers[path]
+            if path in self._running:
+                self._rerun.add(path)
+                return
+            self._running.add(path)
+        
+        while True:
+            try:
                 self.callback(path)
+            except BaseException:
+                with self._timers_lock:
+                    self._running.discard(path)
+                    self._rerun.discard(path)
+                raise
+            
+            with self._timers_lock:
+                if path not in self._rerun:
+                    self._running.discard(path)
+                    return
+                self._rerun.discard(path)
+
+    def cancel_pending(self):
+        """Cancel callbacks that are still waiting out their debounce period."""
+        with self._timers_lock:
+            for timer in self._timers.values():
+                timer.cancel()
+            self._timers.clear()
 
 
 class FileWatcher:
@@ -110,6 +197,7 @@ class FileWatcher:
         self.callback = callback
         self.markdown_root = config.get("directories.markdown_root", "./docs")
         self.observer = None
+        self.event_handler = None
 
     def start(self, daemon: bool = False) -> None:
         """
@@ -121,9 +209,9 @@ class FileWatcher:
         if not os.path.exists(self.markdown_root):
             os.makedirs(self.markdown_root, exist_ok=True)
             
-        event_handler = MarkdownFileEventHandler(self.callback, self.config)
+        self.event_handler = MarkdownFileEventHandler(self.callback, self.config)
         self.observer = Observer()
-        self.observer.schedule(event_handler, self.markdown_root, recursive=True)
+        self.observer.schedule(self.event_handler, self.markdown_root, recursive=True)
         
         self.observer.start()
         
@@ -139,4 +227,6 @@ class FileWatcher:
         if self.observer:
             self.observer.stop()
             self.observer.join()
-            self.observer = None
\ No newline at end of file
+            self.observer = None
+        if self.event_handler:
+            self.event_handler.cancel_pending()
\ No newline at end of file
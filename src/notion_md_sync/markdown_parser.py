@@ -3,26 +3,110 @@ Markdown parser with frontmatter support.
 """
 
 import os
+import re
+import threading
+from collections import OrderedDict
 from typing import Dict, Any, Tuple, Optional, List
 import frontmatter
-import markdown
-from markdown.extensions.toc import TocExtension
-from markdown.extensions.fenced_code import FencedCodeExtension
-from markdown.extensions.tables import TableExtension
+import yaml
+from frontmatter.default_handlers import YAMLHandler
+
+from .utils import atomic_write_text
+
+try:
+    from yaml import CSafeDumper as SafeDumper, CSafeLoader as SafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeDumper, SafeLoader
+
+# A frontmatter delimiter line, as python-frontmatter's YAML handler sees it
+_FM_BOUNDARY_RE = re.compile(r'-{3,}$')
+
+# Lines starting with "# ", and lines starting with any run of "#"
+# (the run's length is the heading level)
+_TITLE_RE = re.compile(r'^# (.*)$', re.MULTILINE)
+_HEADING_RE = re.compile(r'^(#+)(.*)$', re.MULTILINE)
+
+# Number of parsed files MarkdownParser keeps around
+PARSE_CACHE_SIZE = 4096
+
+
+def _open_markdown(file_path: str):
+    """
+    Open a markdown file for reading.
+
+    Lets open() detect missing files instead of checking first, which
+    would cost an extra stat per file.
+
+    Args:
+        file_path: Path to markdown file.
+
+    Returns:
+        Open text file.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+    """
+    try:
+        return open(file_path, 'r', encoding='utf-8')
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Markdown file not found: {file_path}") from None
+
+
+def _dumps(post: frontmatter.Post) -> str:
+    """
+    Serialize a post, keeping its YAML frontmatter keys in their original order.
+
+    Args:
+        post: Post to serialize.
+
+    Returns:
+        File contents with frontmatter.
+    """
+    handler = getattr(post, "handler", None)
+    if handler is None or isinstance(handler, YAMLHandler):
+        return frontmatter.dumps(post, Dumper=SafeDumper, sort_keys=False)
+    # TOML and JSON handlers don't take YAML dumper options
+    return frontmatter.dumps(post)
 
 
 class MarkdownParser:
     """Parser for markdown files with frontmatter."""
 
     def __init__(self):
-        """Initialize the markdown parser with extensions."""
-        self.md = markdown.Markdown(extensions=[
-            'markdown.extensions.extra',
-            'markdown.extensions.codehilite',
-            FencedCodeExtension(),
-            TableExtension(),
-            TocExtension(permalink=True)
-        ])
+        """Initialize the markdown parser."""
+        # The markdown converter is created on first use, so commands that
+        # only read frontmatter never import the markdown package
+        self._md = None
+        # markdown.Markdown keeps per-document state, so conversions from
+        # several sync threads have to take turns
+        self._md_lock = threading.Lock()
+        # Parsed files by path, least recently used first; entries are
+        # ((mtime_ns, size), metadata, raw content, HTML or None)
+        self._parse_cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+    @property
+    def md(self):
+        """The markdown converter, with extensions."""
+        with self._md_lock:
+            return self._get_md()
+
+    def _get_md(self):
+        """Create the markdown converter if needed; call with _md_lock held."""
+        if self._md is None:
+            import markdown
+            from markdown.extensions.toc import TocExtension
+            from markdown.extensions.fenced_code import FencedCodeExtension
+            from markdown.extensions.tables import TableExtension
+            
+            self._md = markdown.Markdown(extensions=[
+                'markdown.extensions.extra',
+                'markdown.extensions.codehilite',
+                FencedCodeExtension(),
+                TableExtension(),
+                TocExtension(permalink=True)
+            ])
+        return self._md
 
     def parse_file(self, file_path: str) -> Tuple[Dict[str, Any], str, str]:
         """
@@ -34,23 +118,129 @@ class MarkdownParser:
         Returns:
             Tuple of (frontmatter, html_content, raw_content)
         """
-        if not os.path.exists(file_path):
-            raise FileNotFoundError(f"Markdown file not found: {file_path}")
+        entry = self._load(file_path)
+        html_content = entry[3]
+        if html_content is None:
+            html_content = self.render_html(entry[2])
+            self._remember(file_path, entry[:3] + (html_content,))
+        return dict(entry[1]), html_content, entry[2]
 
-        with open(file_path, 'r', encoding='utf-8') as f:
-            post = frontmatter.load(f)
-            
-        # Extract frontmatter
-        metadata = post.metadata
+    def parse_file_raw(self, file_path: str) -> Tuple[Dict[str, Any], str]:
+        """
+        Parse a markdown file's frontmatter and content without rendering HTML.
+
+        Args:
+            file_path: Path to markdown file.
+
+        Returns:
+            Tuple of (frontmatter, raw_content)
+        """
+        entry = self._load(file_path)
+        return dict(entry[1]), entry[2]
+
+    def _load(self, file_path: str) -> Tuple[Any, ...]:
+        """
+        Get a file's parse cache entry, parsing the file if it changed.
+
+        Files count as unchanged while their modification time and size
+        stay the same, so repeated parses of a file within a sync cycle
+        (e.g. conflict detection followed by the sync itself) read and
+        parse it only once.
+
+        Args:
+            file_path: Path to markdown file.
+
+        Returns:
+            Tuple of (stat key, frontmatter, raw_content, html_content or None).
+        """
+        try:
+            stat = os.stat(file_path)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Markdown file not found: {file_path}") from None
+        key = (stat.st_mtime_ns, stat.st_size)
         
-        # Get raw content
-        raw_content = post.content
+        with self._cache_lock:
+            entry = self._parse_cache.get(file_path)
+            if entry is not None and entry[0] == key:
+                self._parse_cache.move_to_end(file_path)
+                return entry
+        
+        with _open_markdown(file_path) as f:
+            post = frontmatter.load(f)
         
-        # Convert to HTML
-        self.md.reset()
-        html_content = self.md.convert(raw_content)
+        entry = (key, post.metadata, post.content, None)
+        self._remember(file_path, entry)
+        return entry
+
+    def _remember(self, file_path: str, entry: Tuple[Any, ...]) -> None:
+        """Store a parse cache entry, evicting the least recently used one."""
+        with self._cache_lock:
+            self._parse_cache[file_path] = entry
+            self._parse_cache.move_to_end(file_path)
+            if len(self._parse_cache) > PARSE_CACHE_SIZE:
+                self._parse_cache.popitem(last=False)
+
+    def _forget(self, file_path: str) -> None:
+        """Drop a file from the parse cache after writing it."""
+        with self._cache_lock:
+            self._parse_cache.pop(file_path, None)
+
+    def parse_frontmatter_only(self, file_path: str) -> Dict[str, Any]:
+        """
+        Parse a markdown file's YAML frontmatter without reading its body.
+
+        Reads only up to the closing delimiter, so checking a long document
+        for its notion_page_id costs about as much as checking a short one.
+        Gives the same result as parse_file_raw's frontmatter.
+
+        Args:
+            file_path: Path to markdown file.
+
+        Returns:
+            Frontmatter metadata, empty if the file has none.
+        """
+        with _open_markdown(file_path) as f:
+            # Like python-frontmatter, ignore whitespace before the opening delimiter
+            line = f.readline()
+            while line and not line.strip():
+                line = f.readline()
+            
+            if not _FM_BOUNDARY_RE.match(line.strip()):
+                if line.lstrip().startswith(('+++', '{')):
+                    # TOML or JSON frontmatter; leave it to python-frontmatter
+                    return self.parse_file_raw(file_path)[0]
+                return {}
+            
+            fm_lines = []
+            for line in f:
+                if _FM_BOUNDARY_RE.match(line.rstrip()):
+                    break
+                fm_lines.append(line)
+            else:
+                # No closing delimiter, so the file has no frontmatter
+                return {}
         
-        return metadata, html_content, raw_content
+        try:
+            metadata = yaml.load(''.join(fm_lines), Loader=SafeLoader)
+        except yaml.YAMLError:
+            # Let python-frontmatter report it the way full parses do
+            return self.parse_file_raw(file_path)[0]
+        return metadata if isinstance(metadata, dict) else {}
+
+    def render_html(self, raw_content: str) -> str:
+        """
+        Convert markdown content to HTML.
+
+        Args:
+            raw_content: Markdown content without frontmatter.
+
+        Returns:
+            HTML content.
+        """
+        with self._md_lock:
+            md = self._get_md()
+            md.reset()
+            return md.convert(raw_content)
 
     def update_frontmatter(self, file_path: str, new_metadata: Dict[str, Any]) -> None:
         """
@@ -60,10 +250,7 @@ class MarkdownParser:
             file_path: Path to markdown file.
             new_metadata: New metadata to update.
         """
-        if not os.path.exists(file_path):
-            raise FileNotFoundError(f"Markdown file not found: {file_path}")
-
-        with open(file_path, 'r', encoding='utf-8') as f:
+        with _open_markdown(file_path) as f:
             post = frontmatter.load(f)
             
         # Update metadata
@@ -71,8 +258,8 @@ class MarkdownParser:
             post[key] = value
             
         # Write back to file
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(frontmatter.dumps(post))
+        atomic_write_text(file_path, _dumps(post))
+        self._forget(file_path)
 
     def create_markdown_with_frontmatter(self, file_path: str, metadata: Dict[str, Any], content: str) -> None:
         """
@@ -89,8 +276,8 @@ class MarkdownParser:
         os.makedirs(os.path.dirname(os.path.abspath(file_path)), exist_ok=True)
         
         # Write to file
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(frontmatter.dumps(post))
+        atomic_write_text(file_path, _dumps(post))
+        self._forget(file_path)
 
     def extract_title(self, content: str) -> Optional[str]:
         """
@@ -102,10 +289,9 @@ class MarkdownParser:
         Returns:
             Title or None if not found.
         """
-        lines = content.split('\n')
-        for line in lines:
-            if line.startswith('# '):
-                return line[2:].strip()
+        match = _TITLE_RE.search(content)
+        if match:
+            return match.group(1).strip()
         return None
 
     def extract_headings(self, content: str) -> List[Tuple[int, str]]:
@@ -118,20 +304,7 @@ class MarkdownParser:
         Returns:
             List of tuples (level, heading_text).
         """
-        lines = content.split('\n')
-        headings = []
-        
-        for line in lines:
-            if line.startswith('#'):
-                # Count the number of # characters at the start
-                level = 0
-                for char in line:
-                    if char == '#':
-                        level += 1
-                    else:
-                        break
-                        
-                text = line[level:].strip()
-                headings.append((level, text))
-                
-        return headings
\ No newline at end of file
+        return [
+            (len(hashes), text.strip())
+            for hashes, text in _HEADING_RE.findall(content)
+        ]
@@ -2,46 +2,146 @@
 Notion API client wrapper with additional functionality.
 """
 
-import time
-from typing import Dict, List, Any, Optional
-from notion_client import Client
+import importlib.util
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Dict, Iterator, List, Any, Optional
+
+from .rate_limiter import RateLimiter
+from .utils import notion_id_key
+
+if TYPE_CHECKING:
+    from notion_client import Client
+
+
+# Number of block deletes in flight while replacing a page's content
+DELETE_CONCURRENCY = 8
+
+# Number of child pages retrieved at once by get_child_pages
+CHILD_PAGE_CONCURRENCY = 8
+
+# Blocks requested per call when listing a page's children (the API maximum)
+BLOCK_PAGE_SIZE = 100
+
+# Most blocks a single children.append call accepts
+BLOCK_APPEND_LIMIT = 100
+
+# Error codes with which Notion definitively rejects an ID as a database
+_NOT_A_DATABASE_CODES = frozenset({"object_not_found", "validation_error"})
+
+# How Notion words the validation error for a page ID passed as a database
+_PAGE_NOT_DATABASE_MESSAGE = "is a page, not a database"
+
+
+def _intern_block(block: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Intern the structural strings of a block so repeated blocks share them.
+
+    Every block carries the same handful of keys and a small set of type
+    names; the JSON decoder only shares them within a single response.
+    Only keys and these low-cardinality values are interned, never content.
+
+    Args:
+        block: Block data from the API.
+
+    Returns:
+        The same block, with its structural strings interned.
+    """
+    interned = {sys.intern(key): value for key, value in block.items()}
+    for key in ("object", "type"):
+        value = interned.get(key)
+        if isinstance(value, str):
+            interned[key] = sys.intern(value)
+    
+    parent = interned.get("parent")
+    if isinstance(parent, dict) and isinstance(parent.get("type"), str):
+        parent["type"] = sys.intern(parent["type"])
+    
+    # The block's content lives under a key named after its type
+    block_type = interned.get("type")
+    content = interned.get(block_type) if block_type else None
+    if isinstance(content, dict):
+        interned[block_type] = {sys.intern(key): value for key, value in content.items()}
+    
+    return interned
+
+
+class PageNotFoundError(Exception):
+    """Raised when Notion answers that a page doesn't exist or isn't shared with the integration."""
+
+
+# Shared API clients by token, see get_client
+_clients: Dict[str, "Client"] = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(token: str) -> "Client":
+    """
+    Get the Notion API client for a token, shared by everything in the process.
+
+    Reusing one client means one httpx connection pool, so concurrent
+    workers and repeated calls reuse keep-alive connections and TLS
+    sessions instead of each opening their own. If the h2 package is
+    installed, requests are multiplexed over HTTP/2 as well.
+
+    Args:
+        token: Notion API token.
+
+    Returns:
+        Notion API client.
+    """
+    with _clients_lock:
+        client = _clients.get(token)
+        if client is None:
+            # Imported here so that loading this module stays cheap for
+            # commands that never talk to Notion
+            import httpx
+            from notion_client import Client
+            
+            http_client = httpx.Client(
+                http2=importlib.util.find_spec("h2") is not None,
+                limits=httpx.Limits(max_keepalive_connections=16, max_connections=32),
+            )
+            client = _clients[token] = Client(auth=token, client=http_client)
+        return client
+
+
+def close_clients() -> None:
+    """Close the connection pools of all shared API clients."""
+    with _clients_lock:
+        clients = list(_clients.values())
+        _clients.clear()
+    for client in clients:
+        client.close()
 
 
 class NotionClient:
     """Wrapper around the official Notion API client with additional functionality."""
 
-    def __init__(self, token: str):
+    def __init__(self, token: str, rate_limiter: Optional[RateLimiter] = None):
         """
         Initialize Notion client.
 
         Args:
             token: Notion API token.
+            rate_limiter: Rate limiter shared by all clients using the same
+                token. A private one is created if not given.
         """
-        self.client = Client(auth=token)
-        self.rate_limit_remaining = 1000
-        self.rate_limit_reset_at = 0
-
-    def _handle_rate_limits(self):
-        """Handle rate limiting by waiting if necessary."""
-        if self.rate_limit_remaining < 10:
-            current_time = time.time()
-            if current_time < self.rate_limit_reset_at:
-                wait_time = self.rate_limit_reset_at - current_time + 1
-                time.sleep(wait_time)
-
-    def _update_rate_limits(self, response_headers: Dict[str, str]):
-        """
-        Update rate limit information from response headers.
+        self.client = get_client(token)
+        self.rate_limiter = rate_limiter or RateLimiter()
+        # Database schemas by dashed ID; None for IDs that aren't databases
+        self._databases = {}
+        # Dashed IDs that Notion said name pages when asked for a database
+        self._pages = set()
 
-        Args:
-            response_headers: Response headers from Notion API.
-        """
-        if "x-ratelimit-remaining" in response_headers:
-            self.rate_limit_remaining = int(response_headers["x-ratelimit-remaining"])
-        
-        if "x-ratelimit-reset-at" in response_headers:
-            reset_time = response_headers["x-ratelimit-reset-at"]
-            self.rate_limit_reset_at = time.mktime(time.strptime(reset_time, "%Y-%m-%dT%H:%M:%S.%fZ"))
+    def _call(self, fn, **kwargs):
+        """Send a Notion API request through the rate limiter."""
+        return self.rate_limiter.call(fn, **kwargs)
+
+    def _read(self, fn, **kwargs):
+        """Send a read-only Notion API request, retrying server errors too."""
+        return self.rate_limiter.call(fn, retry_server_errors=True, **kwargs)
 
     def get_page(self, page_id: str) -> Dict[str, Any]:
         """
@@ -52,40 +152,128 @@ class NotionClient:
 
         Returns:
             Page data.
+
+        Raises:
+            PageNotFoundError: If Notion has no page with this ID that the
+                integration can access. Other errors, such as network
+                failures, are raised as they are.
         """
-        self._handle_rate_limits()
-        response = self.client.pages.retrieve(page_id=page_id)
+        try:
+            response = self._read(self.client.pages.retrieve, page_id=page_id)
+        except Exception as e:
+            if getattr(e, "code", None) == "object_not_found":
+                raise PageNotFoundError(f"Page not found: {page_id}") from e
+            raise
         return response
 
-    def get_page_blocks(self, page_id: str) -> List[Dict[str, Any]]:
+    def iter_page_blocks(self, page_id: str) -> Iterator[Dict[str, Any]]:
         """
-        Get all blocks for a page.
+        Iterate over the blocks of a page, fetching further result pages as needed.
+
+        Blocks are yielded as each response arrives, so callers can start
+        working on the first blocks while the rest are still being fetched.
 
         Args:
             page_id: ID of the page to get blocks for.
 
         Returns:
-            List of block data.
+            Iterator over block data.
         """
-        self._handle_rate_limits()
-        blocks = []
         start_cursor = None
         
         while True:
-            response = self.client.blocks.children.list(
+            response = self._read(
+                self.client.blocks.children.list,
                 block_id=page_id,
-                start_cursor=start_cursor
+                start_cursor=start_cursor,
+                page_size=BLOCK_PAGE_SIZE
             )
             
-            blocks.extend(response["results"])
+            for block in response["results"]:
+                yield _intern_block(block)
             
             if not response.get("has_more", False):
                 break
                 
             start_cursor = response.get("next_cursor")
-            self._handle_rate_limits()
-            
-        return blocks
+
+    def get_page_blocks(self, page_id: str) -> List[Dict[str, Any]]:
+        """
+        Get all blocks for a page.
+
+        Args:
+            page_id: ID of the page to get blocks for.
+
+        Returns:
+            List of block data.
+        """
+        return list(self.iter_page_blocks(page_id))
+
+    def get_database(self, database_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a database, remembering the answer for the lifetime of this client.
+
+        Also serves as the probe for whether an ID names a database at all;
+        IDs that Notion rejects as databases are remembered as None.
+
+        Args:
+            database_id: ID of the database to get.
+
+        Returns:
+            Database data, or None if the ID is not a database.
+        """
+        key = notion_id_key(database_id)
+        if key in self._databases:
+            return self._databases[key]
+        
+        try:
+            db = self._read(self.client.databases.retrieve, database_id=database_id)
+        except Exception as e:
+            # Only Notion rejecting the ID settles the question; don't
+            # remember timeouts, rate limits, missing permissions and the like
+            code = getattr(e, "code", None)
+            if code in _NOT_A_DATABASE_CODES:
+                self._databases[key] = None
+                if code == "validation_error" and _PAGE_NOT_DATABASE_MESSAGE in str(e):
+                    self._pages.add(key)
+            return None
+        
+        self._databases[key] = db
+        return db
+
+    def is_database(self, notion_id: str) -> Optional[bool]:
+        """
+        Check whether an ID names a database, using the get_database cache.
+
+        Args:
+            notion_id: ID of a page or database.
+
+        Returns:
+            True if Notion returned a database, False if it said the ID is a
+            page, or None if the lookup didn't settle it (e.g. a network
+            error, or an ID the integration can't see).
+        """
+        if self.get_database(notion_id) is not None:
+            return True
+        if notion_id_key(notion_id) in self._pages:
+            return False
+        return None
+
+    @staticmethod
+    def _find_title_property(db: Dict[str, Any]) -> Optional[str]:
+        """
+        Find the name of a database's title property.
+
+        Args:
+            db: Database data.
+
+        Returns:
+            Title property name, or None if the database has none.
+        """
+        for prop_name, prop_details in db.get("properties", {}).items():
+            if prop_details.get("type") == "title":
+                return prop_name
+        return None
 
     def create_page(self, parent_id: str, title: str, properties: Dict[str, Any] = None) -> Dict[str, Any]:
         """
@@ -99,21 +287,17 @@ class NotionClient:
         Returns:
             Created page data.
         """
-        self._handle_rate_limits()
-        
         if not properties:
             properties = {}
             
         # First, try to determine if this is a database or page ID
-        is_database = False
+        db = self.get_database(parent_id)
+        is_database = db is not None
         
-        try:
-            # Try to retrieve as database first
-            self.client.databases.retrieve(database_id=parent_id)
-            is_database = True
+        if is_database:
             print(f"Identified {parent_id} as a database ID")
-        except Exception:
-            # If that fails, assume it's a page ID
+        else:
+            # Otherwise assume it's a page ID
             print(f"Assuming {parent_id} is a page ID")
         
         # Set up the parent reference based on what we determined
@@ -121,29 +305,20 @@ class NotionClient:
             parent = {"type": "database_id", "database_id": parent_id}
             
             # For database parents, ensure title property exists with the right name
-            # This can vary by database, so we'll retrieve the database to find the title property
-            try:
-                db = self.client.databases.retrieve(database_id=parent_id)
-                title_property = None
-                
-                # Find the title property
-                for prop_name, prop_details in db.get("properties", {}).items():
-                    if prop_details.get("type") == "title":
-                        title_property = prop_name
-                        break
-                
-                if title_property and title_property not in properties:
+            # This can vary by database, so look it up in the database's schema
+            title_property = self._find_title_property(db)
+            
+            if title_property:
+                if title_property not in properties:
                     properties[title_property] = {
                         "title": [{"type": "text", "text": {"content": title}}]
                     }
                     print(f"Using title property: {title_property}")
-            except Exception as e:
-                print(f"Error getting database structure: {str(e)}")
+            elif "Title" not in properties and "title" not in properties:
                 # Fall back to "Title" as the property name
-                if "Title" not in properties and "title" not in properties:
-                    properties["Title"] = {
-                        "title": [{"type": "text", "text": {"content": title}}]
-                    }
+                properties["Title"] = {
+                    "title": [{"type": "text", "text": {"content": title}}]
+                }
         else:
             # For page parents
             parent = {"type": "page_id", "page_id": parent_id}
@@ -158,7 +333,7 @@ class NotionClient:
         print(f"Properties: {properties}")
         
         try:
-            response = self.client.pages.create(parent=parent, properties=properties)
+            response = self._call(self.client.pages.create, parent=parent, properties=properties)
             return response
         except Exception as e:
             # If the first attempt fails, try the opposite parent type
@@ -178,7 +353,7 @@ class NotionClient:
                     }
             
             try:
-                response = self.client.pages.create(parent=parent, properties=properties)
+                response = self._call(self.client.pages.create, parent=parent, properties=properties)
                 return response
             except Exception as e2:
                 error_msg = f"Failed to create page with both parent types. Original error: {str(e)}. Second error: {str(e2)}"
@@ -196,22 +371,86 @@ class NotionClient:
         Returns:
             Updated list of blocks.
         """
-        self._handle_rate_limits()
-        
-        # First, we'll clear existing blocks
-        existing_blocks = self.get_page_blocks(page_id)
-        for block in existing_blocks:
-            self._handle_rate_limits()
-            self.client.blocks.delete(block_id=block["id"])
+        # First, we'll clear existing blocks; deletes are independent, so
+        # overlap them and let the rate limiter pace the requests. Blocks are
+        # handed to the workers as they are listed, so deleting the first
+        # result page overlaps with fetching the next one
+        with ThreadPoolExecutor(max_workers=DELETE_CONCURRENCY) as executor:
+            list(executor.map(
+                lambda block: self._call(self.client.blocks.delete, block_id=block["id"]),
+                self.iter_page_blocks(page_id)
+            ))
             
         # Then add new blocks
-        response = self.client.blocks.children.append(
+        return self.append_blocks(page_id, blocks)
+
+    def append_blocks_chunk(self, page_id: str, chunk: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Append up to BLOCK_APPEND_LIMIT blocks to the end of a page.
+
+        Args:
+            page_id: ID of the page to append to.
+            chunk: Block data to append.
+
+        Returns:
+            List of created blocks.
+        """
+        response = self._call(
+            self.client.blocks.children.append,
             block_id=page_id,
-            children=blocks
+            children=chunk
         )
-        
         return response["results"]
 
+    def append_blocks(self, page_id: str, blocks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Append any number of blocks to the end of a page.
+
+        Notion rejects appends of more than BLOCK_APPEND_LIMIT blocks, so
+        longer documents are sent in chunks. The chunks go out one after
+        another, since each is appended after the previous one.
+
+        Args:
+            page_id: ID of the page to append to.
+            blocks: Block data to append.
+
+        Returns:
+            List of created blocks.
+        """
+        results = []
+        for start in range(0, len(blocks), BLOCK_APPEND_LIMIT):
+            results.extend(self.append_blocks_chunk(page_id, blocks[start:start + BLOCK_APPEND_LIMIT]))
+        return results
+
+    def iter_search_pages(self, query: str = "", filter_pages: bool = True, filter_databases: bool = False) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over search results, fetching further result pages as needed.
+
+        Args:
+            query: Search query. If empty, yields all accessible pages.
+            filter_pages: Whether to include pages in results.
+            filter_databases: Whether to include databases in results.
+
+        Returns:
+            Iterator over page/database data.
+        """
+        filter_conditions = {"value": "page" if filter_pages else "database", "property": "object"}
+        search_args = {"filter": filter_conditions}
+        if query:
+            search_args["query"] = query
+        
+        while True:
+            # The first request has no cursor; older notion-client versions
+            # would send an explicit null
+            response = self._read(self.client.search, **search_args)
+            
+            yield from response.get("results", [])
+            
+            if not response.get("has_more", False):
+                break
+                
+            search_args["start_cursor"] = response.get("next_cursor")
+
     def search_pages(self, query: str = "", filter_pages: bool = True, filter_databases: bool = False) -> List[Dict[str, Any]]:
         """
         Search for pages in Notion workspace.
@@ -224,21 +463,7 @@ class NotionClient:
         Returns:
             List of page/database data.
         """
-        self._handle_rate_limits()
-        
-        filter_conditions = {"value": "page" if filter_pages else "database", "property": "object"}
-        
-        if query:
-            response = self.client.search(
-                query=query,
-                filter=filter_conditions
-            )
-        else:
-            response = self.client.search(
-                filter=filter_conditions
-            )
-        
-        return response.get("results", [])
+        return list(self.iter_search_pages(query, filter_pages, filter_databases))
 
     def list_all_pages(self) -> List[Dict[str, Any]]:
         """
@@ -259,23 +484,20 @@ class NotionClient:
         Returns:
             List of child page data.
         """
-        self._handle_rate_limits()
-        
-        # Get all blocks from the parent page
-        blocks = self.get_page_blocks(parent_page_id)
-        
+        # Get the full page data of every child page block, several pages at
+        # a time, starting while the parent's blocks are still being listed;
+        # results are collected in block order
         child_pages = []
-        for block in blocks:
-            # Check if block is a child page
-            if block.get("type") == "child_page":
-                child_page_id = block.get("id")
-                if child_page_id:
-                    try:
-                        # Get the full page data
-                        page_data = self.get_page(child_page_id)
-                        child_pages.append(page_data)
-                    except Exception as e:
-                        print(f"Warning: Could not access child page {child_page_id}: {str(e)}")
-                        continue
+        with ThreadPoolExecutor(max_workers=CHILD_PAGE_CONCURRENCY) as executor:
+            futures = [
+                (block["id"], executor.submit(self.get_page, block["id"]))
+                for block in self.iter_page_blocks(parent_page_id)
+                if block.get("type") == "child_page" and block.get("id")
+            ]
+            for child_page_id, future in futures:
+                try:
+                    child_pages.append(future.result())
+                except Exception as e:
+                    print(f"Warning: Could not access child page {child_page_id}: {str(e)}")
         
         return child_pages
\ No newline at end of file
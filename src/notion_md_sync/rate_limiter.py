@@ -0,0 +1,117 @@
+"""
+Rate limiting for Notion API requests.
+"""
+
+import random
+import threading
+import time
+from typing import Any, Callable
+
+# Error codes Notion uses for failures on its side that may succeed when retried
+SERVER_ERROR_CODES = frozenset({
+    "internal_server_error",
+    "service_unavailable",
+    "database_connection_unavailable",
+    "gateway_timeout",
+})
+
+# Base of the exponential backoff between retries of server errors, in seconds
+SERVER_ERROR_BACKOFF = 0.25
+
+
+def is_server_error(error: Exception) -> bool:
+    """
+    Check whether an API error is a transient failure on Notion's side.
+
+    Args:
+        error: Exception raised by a Notion API call.
+
+    Returns:
+        True for 5xx responses, False otherwise.
+    """
+    if getattr(error, "code", None) in SERVER_ERROR_CODES:
+        return True
+    status = getattr(error, "status", None)
+    return isinstance(status, int) and status >= 500
+
+
+class RateLimiter:
+    """
+    Token bucket shared by every request sent with the same integration token.
+
+    Notion allows an average of three requests per second per integration and
+    answers anything faster with HTTP 429. Pacing requests at that rate keeps
+    throughput at the ceiling instead of stalling on rate-limit responses.
+    """
+
+    def __init__(self, rate: float = 3.0, burst: int = 3, max_retries: int = 5):
+        """
+        Initialize the rate limiter.
+
+        Args:
+            rate: Sustained number of requests allowed per second.
+            burst: Number of requests that may be sent back to back.
+            max_retries: How often a rate-limited request is retried.
+        """
+        self.rate = rate
+        self.burst = burst
+        self.max_retries = max_retries
+        self._tokens = float(burst)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until a request may be sent."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+
+            # Reserve a token even if none is available yet; a negative
+            # balance is the queue of callers waiting for their turn
+            self._tokens -= 1
+            wait_time = -self._tokens / self.rate if self._tokens < 0 else 0
+
+        if wait_time > 0:
+            time.sleep(wait_time)
+
+    def call(self, fn: Callable[..., Any], *args: Any, retry_server_errors: bool = False,
+             **kwargs: Any) -> Any:
+        """
+        Call a Notion API function once a token is available.
+
+        Requests rejected with a ``rate_limited`` error are retried after the
+        server's Retry-After delay (or an exponential backoff) plus jitter.
+        Server errors are only retried when asked for: a failed write may
+        still have been applied, and sending it again could e.g. create a
+        page twice.
+
+        Args:
+            fn: Notion client function to call.
+            *args: Positional arguments for the function.
+            retry_server_errors: Also retry 5xx responses, for requests that
+                are safe to repeat.
+            **kwargs: Keyword arguments for the function.
+
+        Returns:
+            The function's return value.
+        """
+        attempt = 0
+        while True:
+            self.acquire()
+            try:
+                return fn(*args, **kwargs)
+            except Exception as e:
+                rate_limited = getattr(e, "code", None) == "rate_limited"
+                retryable = rate_limited or (retry_server_errors and is_server_error(e))
+                if not retryable or attempt >= self.max_retries:
+                    raise
+
+                retry_after = (getattr(e, "headers", None) or {}).get("Retry-After")
+                try:
+                    wait_time = float(retry_after)
+                except (TypeError, ValueError):
+                    wait_time = 2 ** attempt if rate_limited else SERVER_ERROR_BACKOFF * 2 ** attempt
+
+                time.sleep(wait_time + random.uniform(0, 0.25))
+                attempt += 1
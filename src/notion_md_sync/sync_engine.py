@@ -2,32 +2,188 @@
 Core synchronization logic between markdown files and Notion pages.
 """
 
+import json
 import os
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from typing import Dict, Any, Optional, Tuple
+from typing import Dict, Any, Iterable, Iterator, Optional, Set, Tuple
 
-from .notion_client import NotionClient
+from .notion_client import NotionClient, PageNotFoundError
 from .markdown_parser import MarkdownParser
 from .block_converter import BlockConverter
 from .config import Config
+from .rate_limiter import RateLimiter
+from .utils import (
+    atomic_write_text,
+    format_notion_id,
+    iter_markdown_files,
+    notion_id_key,
+    page_title,
+    sanitize_filename,
+)
+
+# Number of files synced at once by sync_files_to_notion; the rate limiter
+# keeps the request rate within Notion's limits regardless
+SYNC_CONCURRENCY = 8
+
+# How much later than last_synced a file may be modified and still count
+# as unchanged, in microseconds
+MTIME_GRACE_US = 2_000_000
+
+_PARENT_KINDS = ("database", "page")
+
+# Frontmatter keys that are sync bookkeeping, not database properties
+_META_SKIP = frozenset({"title", "notion_page_id", "last_synced"})
+
+
+def _parent_kind_cache_path() -> str:
+    """
+    Get the path of the file that remembers parent kinds between runs.
+
+    Returns:
+        Path under $XDG_CACHE_HOME (default ~/.cache).
+    """
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache_home, "notion-md-sync", "parent_kind.json")
+
+
+def _load_parent_kinds(cache_path: str) -> Dict[str, str]:
+    """
+    Load remembered parent kinds; a missing or unreadable file is empty.
+
+    Args:
+        cache_path: Path of the cache file.
+
+    Returns:
+        "database" or "page" by dashed parent ID.
+    """
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            kinds = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(kinds, dict):
+        return {}
+    return {key: kind for key, kind in kinds.items() if kind in _PARENT_KINDS}
 
 
 class SyncEngine:
     """Core synchronization engine between markdown files and Notion."""
 
-    def __init__(self, config: Config):
+    def __init__(self, config: Config, rate_limiter: Optional[RateLimiter] = None):
         """
         Initialize the sync engine.
 
         Args:
             config: Application configuration.
+            rate_limiter: Rate limiter for Notion API requests, shared across
+                engines that use the same token.
         """
         self.config = config
         self.notion_token = config.get("notion.token")
-        self.notion_client = NotionClient(self.notion_token) if self.notion_token else None
+        self.notion_client = NotionClient(self.notion_token, rate_limiter) if self.notion_token else None
         self.markdown_parser = MarkdownParser()
         self.block_converter = BlockConverter()
+        # "database" or "page" by dashed parent ID, kept across runs since
+        # an ID never changes kind
+        self._parent_kind_path = _parent_kind_cache_path()
+        self._parent_kind_cache: Dict[str, str] = _load_parent_kinds(self._parent_kind_path)
+        self._parent_kind_lock = threading.Lock()
+        # IDs of pages known to exist, normalized with notion_id_key
+        self._known_pages: Set[str] = set()
+
+    def _get_parent_kind(self, parent_id: str) -> str:
+        """
+        Determine whether a parent ID names a database or a page.
+
+        The answer is remembered, also across runs, so new pages under the
+        same parent probe Notion only once.
+
+        Args:
+            parent_id: ID of the parent page or database.
+
+        Returns:
+            "database" or "page"; "page" if Notion didn't settle it.
+        """
+        key = format_notion_id(parent_id)
+        kind = self._parent_kind_cache.get(key)
+        if kind is not None:
+            return kind
+        
+        is_database = self.notion_client.is_database(key)
+        kind = "database" if is_database else "page"
+        if is_database is not None:
+            # Only definitive answers are remembered; a guess made after a
+            # timeout or a missing permission would outlive its cause
+            self._remember_parent_kind(key, kind)
+        return kind
+
+    def _remember_parent_kind(self, key: str, kind: str) -> None:
+        """
+        Remember a parent's kind, also for later runs.
+
+        Args:
+            key: Dashed parent ID.
+            kind: "database" or "page".
+        """
+        with self._parent_kind_lock:
+            # Merge with what is on disk now, so entries saved by other
+            # engines or processes since this one started aren't lost
+            kinds = _load_parent_kinds(self._parent_kind_path)
+            kinds.update(self._parent_kind_cache)
+            kinds[key] = kind
+            self._parent_kind_cache = kinds
+            try:
+                os.makedirs(os.path.dirname(self._parent_kind_path), exist_ok=True)
+                atomic_write_text(self._parent_kind_path, json.dumps(kinds))
+            except OSError as e:
+                print(f"Warning: Could not save parent cache to {self._parent_kind_path}: {str(e)}")
+
+    def _page_exists(self, page_id: str) -> bool:
+        """
+        Check whether a linked Notion page exists and is accessible.
+
+        Pages this engine has already seen are not fetched again, so a file
+        that is pushed repeatedly (e.g. while watching) skips the probe.
+
+        Args:
+            page_id: ID of the Notion page.
+
+        Returns:
+            True if the page exists, False if Notion says it doesn't (or that
+            we don't have access).
+
+        Raises:
+            Exception: If the lookup failed without an answer. Treating that
+                as a missing page would create a duplicate of the page.
+        """
+        key = notion_id_key(page_id)
+        if key in self._known_pages:
+            return True
+        try:
+            self.notion_client.get_page(page_id)
+        except PageNotFoundError:
+            return False
+        self._known_pages.add(key)
+        return True
+
+    def _needs_new_page(self, file_path: str) -> bool:
+        """
+        Check whether pushing a file will create a Notion page for it.
+
+        Args:
+            file_path: Path to markdown file.
+
+        Returns:
+            True if the file isn't linked to a page yet, False otherwise
+            (also if it can't be read; syncing it reports that).
+        """
+        try:
+            return not self.markdown_parser.parse_frontmatter_only(file_path).get("notion_page_id")
+        except Exception:
+            return False
 
     def sync_file_to_notion(self, file_path: str) -> Tuple[bool, str]:
         """
@@ -44,20 +200,11 @@ class SyncEngine:
 
         try:
             # Parse the markdown file
-            metadata, html_content, raw_content = self.markdown_parser.parse_file(file_path)
+            metadata, raw_content = self.markdown_parser.parse_file_raw(file_path)
             
             # Check if this file is already linked to a Notion page
             notion_page_id = metadata.get("notion_page_id")
-            page_exists = False
-            
-            if notion_page_id:
-                try:
-                    # Try to fetch the page to see if it exists
-                    self.notion_client.get_page(notion_page_id)
-                    page_exists = True
-                except Exception as e:
-                    # Page doesn't exist or we don't have access
-                    page_exists = False
+            page_exists = bool(notion_page_id) and self._page_exists(notion_page_id)
             
             # Get or create title
             title = metadata.get("title")
@@ -70,20 +217,29 @@ class SyncEngine:
             
             # Convert markdown to Notion blocks
             blocks = self.block_converter.markdown_to_blocks(raw_content)
+            frontmatter_updates = {}
             
             if page_exists:
                 # Update existing page
-                self.notion_client.update_page_blocks(notion_page_id, blocks)
-                message = f"Updated Notion page: {title}"
-            else:
+                try:
+                    self.notion_client.update_page_blocks(notion_page_id, blocks)
+                    message = f"Updated Notion page: {title}"
+                except Exception:
+                    # The page may have been deleted since it was last seen;
+                    # if so, create a new one like for an unlinked file
+                    self._known_pages.discard(notion_id_key(notion_page_id))
+                    if self._page_exists(notion_page_id):
+                        raise
+                    page_exists = False
+            
+            if not page_exists:
                 # Create new page
                 parent_id = self.config.get("notion.parent_page_id")
                 if not parent_id:
                     return False, "Parent page ID not configured"
                     
                 # Format parent_id with dashes if needed (sometimes Notion requires this format)
-                if len(parent_id) == 32 and "-" not in parent_id:
-                    parent_id = f"{parent_id[0:8]}-{parent_id[8:12]}-{parent_id[12:16]}-{parent_id[16:20]}-{parent_id[20:]}"
+                parent_id = format_notion_id(parent_id)
                 
                 # Determine if this is a database or page ID (this will be automatically handled by NotionClient)
                 
@@ -103,57 +259,101 @@ class SyncEngine:
                 # Add any additional properties from metadata
                 # But only if creating a database page - don't add properties to regular pages
                 # as they may not be supported
-                try:
-                    # Try to determine if this is a database first
-                    self.notion_client.client.databases.retrieve(database_id=parent_id)
-                    
-                    # If we get here, it's a database and we can add properties
-                    for key, value in metadata.items():
-                        if key not in ["title", "notion_page_id", "last_synced"]:
-                            # Simple text property for now
-                            properties[key] = {
-                                "rich_text": [
-                                    {
-                                        "type": "text",
-                                        "text": {
-                                            "content": str(value)
-                                        }
+                if self._get_parent_kind(parent_id) == "database":
+                    # Simple text property for now
+                    properties.update({
+                        key: {
+                            "rich_text": [
+                                {
+                                    "type": "text",
+                                    "text": {
+                                        "content": str(value)
                                     }
-                                ]
-                            }
-                except Exception:
-                    # If it's not a database, only use the title property
-                    pass
+                                }
+                            ]
+                        }
+                        for key, value in metadata.items()
+                        if key not in _META_SKIP
+                    })
                 
                 # Create the page
                 page = self.notion_client.create_page(parent_id, title, properties)
                 notion_page_id = page["id"]
+                self._known_pages.add(notion_id_key(notion_page_id))
                 
                 # Add blocks to the page
                 self.notion_client.update_page_blocks(notion_page_id, blocks)
                 
-                # Update the frontmatter with the new page ID
-                self.markdown_parser.update_frontmatter(
-                    file_path, 
-                    {
-                        "notion_page_id": notion_page_id,
-                        "last_synced": datetime.now().isoformat()
-                    }
-                )
+                # Link the file to the new page
+                frontmatter_updates["notion_page_id"] = notion_page_id
                 
                 message = f"Created new Notion page: {title}"
             
-            # Update last_synced in frontmatter
-            self.markdown_parser.update_frontmatter(
-                file_path,
-                {"last_synced": datetime.now().isoformat()}
-            )
+            # Record the sync (and the new page ID) in a single write; taken
+            # after the upload so the page's edit time isn't after last_synced
+            frontmatter_updates["last_synced"] = datetime.now().isoformat()
+            self.markdown_parser.update_frontmatter(file_path, frontmatter_updates)
             
             return True, message
             
         except Exception as e:
             return False, f"Error syncing file to Notion: {str(e)}"
 
+    def sync_files_to_notion(self, file_paths: Iterable[str], concurrency: int = SYNC_CONCURRENCY) -> Iterator[Tuple[str, bool, str]]:
+        """
+        Sync several markdown files to Notion at once.
+
+        Each file takes several sequential API round trips, so syncing them
+        side by side hides most of that latency; the rate limiter still
+        paces the requests themselves. The parent's kind, which every new
+        page depends on, is looked up once before the files are started.
+
+        Args:
+            file_paths: Paths to markdown files.
+            concurrency: Maximum number of files synced at the same time.
+
+        Returns:
+            Iterator over (file_path, success, message) tuples, in the order
+            the files finish.
+        """
+        file_paths = list(file_paths)
+        parent_id = self.config.get("notion.parent_page_id")
+        if self.notion_client and parent_id and any(map(self._needs_new_page, file_paths)):
+            # Otherwise every worker that creates a page runs into the empty
+            # cache at the same time and probes the parent itself
+            try:
+                self._get_parent_kind(parent_id)
+            except Exception:
+                # Each file that needs the parent reports the error itself
+                pass
+        
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            futures = {
+                executor.submit(self.sync_file_to_notion, file_path): file_path
+                for file_path in file_paths
+            }
+            for future in as_completed(futures):
+                success, message = future.result()
+                yield futures[future], success, message
+
+    def sync_directory(self, root: Optional[str] = None, concurrency: int = SYNC_CONCURRENCY) -> Iterator[Tuple[str, bool, str]]:
+        """
+        Sync every markdown file below a directory to Notion.
+
+        Files matching the configured exclusion patterns are left out.
+
+        Args:
+            root: Directory to sync. Defaults to the configured markdown root.
+            concurrency: Maximum number of files synced at the same time.
+
+        Returns:
+            Iterator over (file_path, success, message) tuples, in the order
+            the files finish.
+        """
+        root = root or self.config.get("directories.markdown_root", "./docs")
+        excluded_patterns = self.config.get("directories.excluded_patterns", [])
+        return self.sync_files_to_notion(iter_markdown_files(root, excluded_patterns), concurrency)
+
     def sync_notion_to_file(self, notion_page_id: str, file_path: Optional[str] = None) -> Tuple[bool, str]:
         """
         Sync a Notion page to a markdown file.
@@ -171,14 +371,14 @@ class SyncEngine:
         try:
             # Get the page from Notion
             page = self.notion_client.get_page(notion_page_id)
+            self._known_pages.add(notion_id_key(notion_page_id))
             
             # Get page title
-            title = page.get("properties", {}).get("title", {}).get("title", [{}])[0].get("text", {}).get("content", "Untitled")
-            
-            # Get page blocks
-            blocks = self.notion_client.get_page_blocks(notion_page_id)
+            title = page_title(page)
             
-            # Convert blocks to markdown
+            # Convert the page's blocks to markdown as they are fetched,
+            # instead of holding every block of a long page at once
+            blocks = self.notion_client.iter_page_blocks(notion_page_id)
             markdown_content = self.block_converter.blocks_to_markdown(blocks)
             
             # Create metadata
@@ -193,10 +393,13 @@ class SyncEngine:
                 if key != "title":
                     # Try to extract simple text properties
                     if value.get("type") == "rich_text":
-                        rich_text = value.get("rich_text", [])
+                        rich_text = value.get("rich_text")
                         if rich_text:
-                            text_content = rich_text[0].get("text", {}).get("content", "")
-                            metadata[key] = text_content
+                            try:
+                                metadata[key] = rich_text[0]["text"]["content"]
+                            except (KeyError, TypeError):
+                                # Mentions and equations carry no text object
+                                metadata[key] = ""
             
             if file_path:
                 # Check if file exists
@@ -214,8 +417,7 @@ class SyncEngine:
                 os.makedirs(markdown_root, exist_ok=True)
                 
                 # Sanitize title for filename
-                filename = "".join([c if c.isalnum() or c in [' ', '-', '_'] else '' for c in title])
-                filename = filename.replace(' ', '-').lower()
+                filename = sanitize_filename(title)
                 
                 file_path = os.path.join(markdown_root, f"{filename}.md")
                 
@@ -237,37 +439,62 @@ class SyncEngine:
             notion_page_id: Notion page ID.
 
         Returns:
-            True if there are conflicts, False otherwise.
+            True if there are conflicts, False otherwise. Files whose sync
+            state can't be read are reported as conflicting.
+
+        Raises:
+            Exception: If the Notion page can't be retrieved.
         """
         try:
-            # Parse the markdown file
-            metadata, _, _ = self.markdown_parser.parse_file(file_path)
+            # Only the frontmatter is needed; don't read or render the body
+            metadata = self.markdown_parser.parse_frontmatter_only(file_path)
             
             # Get last sync time
             last_synced = metadata.get("last_synced")
             if not last_synced:
                 # Never synced before, so no conflicts
                 return False
-                
-            last_synced_dt = datetime.fromisoformat(last_synced)
             
-            # Get page from Notion
-            page = self.notion_client.get_page(notion_page_id)
-            
-            # Get last edited time from Notion
-            notion_last_edited = page.get("last_edited_time")
-            notion_last_edited_dt = datetime.fromisoformat(notion_last_edited.replace("Z", "+00:00"))
-            
-            # Get file last modified time
-            file_last_modified = os.path.getmtime(file_path)
-            file_last_modified_dt = datetime.fromtimestamp(file_last_modified)
+            last_synced_us = _timestamp_us(last_synced)
             
-            # Check if both were modified since last sync
-            notion_modified = notion_last_edited_dt > last_synced_dt
-            file_modified = file_last_modified_dt > last_synced_dt
-            
-            return notion_modified and file_modified
-            
-        except Exception:
+            # Get file last modified time; syncing writes last_synced into
+            # the file itself, just before its modification time
+            file_last_modified_us = os.stat(file_path).st_mtime_ns // 1000
+            file_modified = file_last_modified_us > last_synced_us + MTIME_GRACE_US
+        except (OSError, ValueError, TypeError):
             # If we can't determine, assume there are conflicts
-            return True
\ No newline at end of file
+            return True
+        
+        if not file_modified:
+            # Only changes on the Notion side, which can't conflict
+            return False
+        
+        # Get last edited time from Notion
+        page = self.notion_client.get_page(notion_page_id)
+        try:
+            notion_modified = _timestamp_us(page["last_edited_time"]) > last_synced_us
+        except (KeyError, ValueError, TypeError):
+            return True
+        
+        return notion_modified
+
+
+def _timestamp_us(value: Any) -> int:
+    """
+    Convert a timestamp to integer Unix microseconds.
+
+    Args:
+        value: ISO 8601 string (a trailing "Z" means UTC) or datetime, as
+            found in frontmatter or API responses. Times without an offset
+            are local time, which is how last_synced is written.
+
+    Returns:
+        Microseconds since the Unix epoch.
+    """
+    if not isinstance(value, datetime):
+        value = str(value)
+        # fromisoformat only accepts a "Z" suffix from Python 3.11 on
+        if value.endswith("Z"):
+            value = value[:-1] + "+00:00"
+        value = datetime.fromisoformat(value)
+    return int(value.timestamp() * 1_000_000)
@@ -0,0 +1,212 @@
+"""
+Shared helpers for Notion Markdown Sync.
+"""
+
+import fnmatch
+import functools
+import os
+import re
+import threading
+from typing import Any, Dict, Iterable, Iterator, Optional, Pattern
+
+MARKDOWN_SUFFIXES = (".md", ".markdown")
+
+# A Notion ID: 32 hex digits, optionally grouped 8-4-4-4-12 with dashes
+_NOTION_ID_RE = re.compile(
+    r"^([0-9a-f]{8})-?([0-9a-f]{4})-?([0-9a-f]{4})-?([0-9a-f]{4})-?([0-9a-f]{12})$",
+    re.IGNORECASE,
+)
+
+# Anything that is not a letter, digit, underscore, space or hyphen; \w
+# matches exactly the characters str.isalnum() accepts, plus underscore
+_FILENAME_STRIP_RE = re.compile(r"[^\w \-]+")
+
+
+def sanitize_filename(title: str) -> str:
+    """
+    Turn a page title into a markdown file name (without extension).
+
+    Args:
+        title: Page title.
+
+    Returns:
+        Lowercase title with spaces replaced by hyphens and every character
+        other than letters, digits, hyphens and underscores removed.
+    """
+    return _FILENAME_STRIP_RE.sub("", title).replace(" ", "-").lower()
+
+
+@functools.lru_cache(maxsize=4096)
+def format_notion_id(raw_id: str) -> str:
+    """
+    Format a Notion page or database ID as a dashed UUID.
+
+    Args:
+        raw_id: ID with or without dashes.
+
+    Returns:
+        ID in lowercase 8-4-4-4-12 form.
+
+    Raises:
+        ValueError: If raw_id is not a Notion ID.
+    """
+    match = _NOTION_ID_RE.match(raw_id.strip())
+    if not match:
+        raise ValueError(f"Invalid Notion ID: {raw_id!r}")
+    return "-".join(match.groups()).lower()
+
+
+def notion_id_key(notion_id: str) -> str:
+    """
+    Normalize an ID so all its spellings share cache entries.
+
+    Args:
+        notion_id: ID with or without dashes.
+
+    Returns:
+        The dashed form of the ID, or the ID unchanged if it isn't a
+        well-formed Notion ID.
+    """
+    try:
+        return format_notion_id(notion_id)
+    except ValueError:
+        return notion_id
+
+
+def page_title(page: Dict[str, Any], default: str = "Untitled") -> str:
+    """
+    Get the plain title of a Notion page object.
+
+    Args:
+        page: Page object returned by the Notion API.
+        default: Value returned when the page has no title text.
+
+    Returns:
+        Content of the first text run in the page's title property.
+    """
+    try:
+        return page["properties"]["title"]["title"][0]["text"]["content"]
+    except (KeyError, IndexError, TypeError):
+        return default
+
+
+def compile_exclusions(patterns: Optional[Iterable[str]]) -> Optional[Pattern]:
+    """
+    Compile glob exclusion patterns into a single regular expression.
+
+    Args:
+        patterns: Glob patterns such as ``*.tmp`` or ``node_modules/**``.
+
+    Returns:
+        Compiled pattern matching any of the globs, or None if there are none.
+    """
+    patterns = [p for p in patterns or [] if p]
+    if not patterns:
+        return None
+    return re.compile("|".join(fnmatch.translate(p) for p in patterns))
+
+
+def _is_excluded_dir(excluded: Pattern, name: str, rel_path: str) -> bool:
+    """Check a directory against compiled exclusions, with and without a trailing slash."""
+    return any(excluded.match(p) for p in (name, name + "/", rel_path, rel_path + "/"))
+
+
+def is_excluded(excluded: Optional[Pattern], rel_path: str) -> bool:
+    """
+    Check a file path against compiled exclusions.
+
+    Uses the same rules as iter_markdown_files, so a file is excluded when
+    it or any of its parent directories is.
+
+    Args:
+        excluded: Pattern from compile_exclusions, or None.
+        rel_path: Path relative to the markdown root, using forward slashes.
+
+    Returns:
+        True if the path is excluded.
+    """
+    if excluded is None:
+        return False
+    parts = rel_path.split("/")
+    for depth in range(1, len(parts)):
+        if _is_excluded_dir(excluded, parts[depth - 1], "/".join(parts[:depth])):
+            return True
+    return bool(excluded.match(parts[-1]) or excluded.match(rel_path))
+
+
+def iter_markdown_files(root: str, excluded_patterns: Optional[Iterable[str]] = None) -> Iterator[str]:
+    """
+    Yield the paths of all markdown files below a directory.
+
+    Exclusion patterns are matched against both the entry's name and its
+    path relative to root (with forward slashes). Directories are matched
+    with a trailing slash and excluded ones are not descended into, so
+    ``node_modules/**`` skips every node_modules tree.
+
+    Args:
+        root: Directory to search.
+        excluded_patterns: Glob patterns of paths to leave out.
+
+    Returns:
+        Iterator over markdown file paths, each joined onto root.
+    """
+    excluded = compile_exclusions(excluded_patterns)
+    stack = [(root, "")]
+    while stack:
+        directory, rel_dir = stack.pop()
+        try:
+            entries = os.scandir(directory)
+        except OSError:
+            # Like os.walk, skip subdirectories that can't be read or were
+            # removed in the meantime; an unreadable root is still an error
+            if not rel_dir:
+                raise
+            continue
+        with entries:
+            for entry in entries:
+                rel_path = rel_dir + entry.name
+                if entry.is_dir():
+                    if excluded and _is_excluded_dir(excluded, entry.name, rel_path):
+                        continue
+                    # Don't follow symlinked directories, same as os.walk's default
+                    if not entry.is_symlink():
+                        stack.append((entry.path, rel_path + "/"))
+                elif entry.name.lower().endswith(MARKDOWN_SUFFIXES):
+                    if excluded and (excluded.match(entry.name) or excluded.match(rel_path)):
+                        continue
+                    yield entry.path
+
+
+def atomic_write_text(file_path: str, text: str, fsync: bool = False) -> None:
+    """
+    Replace a file's contents without ever leaving it partially written.
+
+    The text is written to a temporary file next to the target, which is
+    then renamed over it, so readers (and a crash) see either the old or
+    the new contents. An existing file keeps its permissions, and a
+    symlinked file stays a symlink.
+
+    Args:
+        file_path: Path of the file to write.
+        text: New contents.
+        fsync: Flush the new contents to disk before replacing the file.
+    """
+    target = os.path.realpath(file_path)
+    tmp_path = f"{target}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(text)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        try:
+            os.chmod(tmp_path, os.stat(target).st_mode & 0o7777)
+        except FileNotFoundError:
+            pass
+        os.replace(tmp_path, target)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
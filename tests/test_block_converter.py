@@ -0,0 +1,85 @@
+"""
+Tests for markdown to Notion block conversion.
+"""
+
+import pytest
+from notion_md_sync.block_converter import Block, BlockConverter, to_notion_dict
+
+
+def test_markdown_to_blocks_crlf_line_endings():
+    """Test that CRLF input converts the same as LF input."""
+    converter = BlockConverter()
+    
+    markdown_content = "# Title\n\n- Item\n\n```python\nprint('hi')\n```\n"
+    
+    lf_blocks = converter.markdown_to_blocks(markdown_content)
+    crlf_blocks = converter.markdown_to_blocks(markdown_content.replace("\n", "\r\n"))
+    
+    assert crlf_blocks == lf_blocks
+    assert crlf_blocks[2]["code"]["rich_text"][0]["text"]["content"] == "print('hi')"
+
+
+def test_markdown_to_blocks_returns_independent_blocks():
+    """Test that repeated content never yields shared block objects."""
+    converter = BlockConverter()
+    
+    blocks = converter.markdown_to_blocks("# Same\n\n# Same")
+    again = converter.markdown_to_blocks("# Same")
+    
+    # Callers (and the Notion client) are free to mutate what they get back
+    blocks[0]["heading_1"]["rich_text"][0]["text"]["content"] = "Changed"
+    
+    assert blocks[1]["heading_1"]["rich_text"][0]["text"]["content"] == "Same"
+    assert again[0]["heading_1"]["rich_text"][0]["text"]["content"] == "Same"
+
+
+def test_code_block_keeps_indentation_and_indented_closing_fence():
+    """Test code block bodies keep indentation and close on an indented fence."""
+    converter = BlockConverter()
+    
+    markdown_content = """```python
+def hello():
+    return "hi"
+
+  ```
+After the code.
+"""
+    
+    blocks = converter.markdown_to_blocks(markdown_content)
+    
+    assert [b["type"] for b in blocks] == ["code", "paragraph"]
+    assert blocks[0]["code"]["language"] == "python"
+    assert blocks[0]["code"]["rich_text"][0]["text"]["content"] == 'def hello():\n    return "hi"\n'
+
+
+def test_empty_code_block_has_empty_rich_text():
+    """Test that an empty code block carries no text runs."""
+    converter = BlockConverter()
+    
+    blocks = converter.markdown_to_blocks("```\n```")
+    
+    assert blocks == [{"type": "code", "code": {"rich_text": [], "language": ""}}]
+    assert converter.blocks_to_markdown(blocks) == "```\n\n```\n"
+
+
+def test_parse_blocks_matches_markdown_to_blocks():
+    """Test that lightweight blocks convert to the same Notion blocks."""
+    converter = BlockConverter()
+    
+    markdown_content = "# Title\n\nText\n\n```sh\nls\n```\n\n1. One\n"
+    
+    parsed = converter.parse_blocks(markdown_content)
+    
+    assert parsed[0] == Block("heading_1", "Title", None)
+    assert parsed[2].lang == "sh"
+    assert [to_notion_dict(b) for b in parsed] == converter.markdown_to_blocks(markdown_content)
+
+
+def test_blocks_to_markdown_accepts_iterators():
+    """Test that blocks can be streamed in instead of passed as a list."""
+    converter = BlockConverter()
+    
+    blocks = converter.markdown_to_blocks("# Title\n\nText\n\n- Item\n")
+    
+    assert converter.blocks_to_markdown(iter(blocks)) == converter.blocks_to_markdown(blocks)
+    assert converter.blocks_to_markdown(iter([])) == ""
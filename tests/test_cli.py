@@ -0,0 +1,122 @@
+"""
+Tests for the command-line interface.
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import click
+import pytest
+from click.testing import CliRunner
+from notion_md_sync import file_watcher, sync_engine
+from notion_md_sync.cli import _get_concurrency, _unique_filename, cli
+from notion_md_sync.config import Config
+from notion_md_sync.markdown_parser import MarkdownParser
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+
+
+def test_help_does_not_import_notion_client():
+    """Test that --help does not pay for importing the Notion SDK."""
+    code = (
+        "import sys\n"
+        "from notion_md_sync.cli import cli\n"
+        "try:\n"
+        "    cli(['--help'])\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        "assert 'notion_client' not in sys.modules, 'notion_client was imported'\n"
+    )
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [SRC_DIR, env.get("PYTHONPATH")]))
+    
+    result = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True)
+    
+    assert result.returncode == 0, result.stderr
+
+
+def test_frontmatter_lookup_does_not_import_converters():
+    """Test that reading frontmatter doesn't import markdown or the Notion SDK."""
+    code = (
+        "import os, sys, tempfile\n"
+        "from notion_md_sync.sync_engine import SyncEngine\n"
+        "from notion_md_sync.markdown_parser import MarkdownParser\n"
+        "with tempfile.NamedTemporaryFile('w', suffix='.md', delete=False) as f:\n"
+        "    f.write('---\\nnotion_page_id: abc\\n---\\n# Title\\n')\n"
+        "metadata = MarkdownParser().parse_frontmatter_only(f.name)\n"
+        "os.unlink(f.name)\n"
+        "assert metadata == {'notion_page_id': 'abc'}\n"
+        "for name in ('markdown', 'notion_client', 'httpx'):\n"
+        "    assert name not in sys.modules, name + ' was imported'\n"
+    )
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [SRC_DIR, env.get("PYTHONPATH")]))
+    
+    result = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True)
+    
+    assert result.returncode == 0, result.stderr
+
+
+def test_unique_filename():
+    """Test that colliding names get a counter suffix and are reserved."""
+    existing = {"notes.md", "notes-1.md"}
+    
+    assert _unique_filename(existing, "notes", ".md") == "notes-2.md"
+    assert _unique_filename(existing, "notes", ".md") == "notes-3.md"
+    assert _unique_filename(existing, "other", ".md") == "other.md"
+    assert {"notes-2.md", "notes-3.md", "other.md"} <= existing
+
+
+def test_get_concurrency_rejects_invalid_config():
+    """Test that a non-numeric sync.concurrency is reported instead of crashing."""
+    config = Config("nonexistent.yaml")
+    assert _get_concurrency(config, None, 3) == 3
+    assert _get_concurrency(config, 5, 3) == 5
+    
+    config.set("sync.concurrency", "lots")
+    with pytest.raises(click.BadParameter):
+        _get_concurrency(config, None, 3)
+
+
+def test_watch_retries_failed_pushes(monkeypatch):
+    """Test that a watched file whose push failed is pushed again, also after a restart."""
+    outcomes = [False, True]
+    pushes = []
+    
+    class FakeEngine:
+        def __init__(self, config, rate_limiter=None):
+            self.markdown_parser = MarkdownParser()
+        
+        def sync_file_to_notion(self, file_path):
+            pushes.append(file_path)
+            return outcomes[len(pushes) - 1], "done"
+    
+    class FakeWatcher:
+        def __init__(self, config, callback):
+            self.callback = callback
+        
+        def start(self, daemon=False):
+            self.callback(file_path)
+    
+    monkeypatch.setattr(sync_engine, "SyncEngine", FakeEngine)
+    monkeypatch.setattr(file_watcher, "FileWatcher", FakeWatcher)
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        config_path = os.path.join(temp_dir, "config.yaml")
+        with open(config_path, "w") as f:
+            f.write(
+                "notion: {token: secret_test, parent_page_id: abc}\n"
+                "sync: {direction: markdown_to_notion}\n"
+                f"directories: {{markdown_root: '{temp_dir}'}}\n"
+            )
+        file_path = os.path.join(temp_dir, "note.md")
+        with open(file_path, "w") as f:
+            f.write("# Note\n")
+        
+        # Each invocation is a fresh watcher seeing the same, unchanged file
+        for _ in range(3):
+            result = CliRunner().invoke(cli, ["--config", config_path, "watch"], obj={})
+            assert result.exception is None, result.output
+    
+    assert len(pushes) == 2
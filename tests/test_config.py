@@ -98,4 +98,48 @@ sync:
         config.set("notion.parent_page_id", "")
         assert config.validate() is True
     finally:
-        os.unlink(config_path)
\ No newline at end of file
+        os.unlink(config_path)
+
+
+def test_config_env_override_snapshot(monkeypatch):
+    """Test that environment overrides are read when the config is created."""
+    monkeypatch.setenv("NOTION_TOKEN", "env_token")
+    config = Config("nonexistent.yaml")
+    config.set("notion.token", "file_token")
+    
+    assert config.get("notion.token") == "env_token"
+    
+    monkeypatch.delenv("NOTION_TOKEN")
+    assert config.get("notion.token") == "env_token"
+    
+    config.clear_env_cache()
+    assert config.get("notion.token") == "file_token"
+
+
+def test_config_save_replaces_file():
+    """Test that save writes values set through set() without leaving a temp file."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        config_path = os.path.join(temp_dir, "config.yaml")
+        with open(config_path, "w") as f:
+            f.write("notion:\n  token: test_token\n")
+        
+        config = Config(config_path)
+        config.set("sync.direction", "bidirectional")
+        config.save()
+        
+        saved = Config(config_path)
+        assert saved.get("notion.token") == "test_token"
+        assert saved.get("sync.direction") == "bidirectional"
+        assert os.listdir(temp_dir) == ["config.yaml"]
+
+
+def test_config_save_writes_direct_changes():
+    """Test that save writes changes made to config_data without set()."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        config_path = os.path.join(temp_dir, "config.yaml")
+        
+        config = Config(config_path)
+        config.config_data["notion"] = {"token": "direct_token"}
+        config.save()
+        
+        assert Config(config_path).get("notion.token") == "direct_token"
@@ -0,0 +1,40 @@
+"""
+Tests for the persistent digest store.
+"""
+
+import os
+import tempfile
+
+from notion_md_sync.digest_store import DigestStore, file_digest
+
+
+def test_digest_store_survives_restart():
+    """Test that recorded digests are loaded again by a new store."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_path = os.path.join(temp_dir, "note.md")
+        with open(file_path, "w") as f:
+            f.write("# Note\n")
+        
+        store = DigestStore.for_directory(temp_dir)
+        digest = file_digest(file_path)
+        assert not store.is_unchanged(file_path, digest)
+        
+        store.record(file_path, digest)
+        
+        reloaded = DigestStore.for_directory(temp_dir)
+        assert reloaded.is_unchanged(file_path, file_digest(file_path))
+        
+        with open(file_path, "a") as f:
+            f.write("More text\n")
+        assert not reloaded.is_unchanged(file_path, file_digest(file_path))
+
+
+def test_digest_store_ignores_unreadable_files():
+    """Test that files that can't be hashed are never considered unchanged."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        missing_path = os.path.join(temp_dir, "missing.md")
+        store = DigestStore.for_directory(temp_dir)
+        
+        assert file_digest(missing_path) is None
+        store.record(missing_path, None)
+        assert not store.is_unchanged(missing_path, None)
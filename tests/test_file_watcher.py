@@ -0,0 +1,124 @@
+"""
+Tests for file watching.
+"""
+
+import os
+import time
+from notion_md_sync.config import Config
+from notion_md_sync.file_watcher import MarkdownFileEventHandler
+from watchdog.events import FileMovedEvent
+
+
+def _make_handler(root, patterns, callback=lambda path: None):
+    config = Config("nonexistent.yaml")
+    config.set("directories.markdown_root", root)
+    config.set("directories.excluded_patterns", patterns)
+    return MarkdownFileEventHandler(callback, config)
+
+
+def test_excluded_patterns_are_relative_to_markdown_root():
+    """Test that exclusions match paths below the watched directory."""
+    root = os.path.abspath("docs")
+    handler = _make_handler(root, ["*.tmp", "node_modules/**", "drafts/*"])
+    
+    assert handler._is_excluded(os.path.join(root, "node_modules", "pkg", "README.md"))
+    assert handler._is_excluded(os.path.join(root, "guide", "node_modules", "a.md"))
+    assert handler._is_excluded(os.path.join(root, "notes.md.tmp"))
+    assert handler._is_excluded(os.path.join(root, "drafts", "idea.md"))
+    assert not handler._is_excluded(os.path.join(root, "guide", "intro.md"))
+    assert not handler._is_excluded(os.path.join(root, "index.md"))
+
+
+def test_nested_directory_prefix_is_anchored_at_root():
+    """Test that multi-level directory prefixes only match from the root."""
+    root = os.path.abspath("docs")
+    handler = _make_handler(root, ["private/drafts/**"])
+    
+    assert handler._is_excluded(os.path.join(root, "private", "drafts", "a.md"))
+    assert handler._is_excluded(os.path.join(root, "private", "drafts", "old", "b.md"))
+    assert not handler._is_excluded(os.path.join(root, "private", "a.md"))
+    assert not handler._is_excluded(os.path.join(root, "team", "private", "drafts", "a.md"))
+
+
+def test_no_excluded_patterns():
+    """Test that nothing is excluded without patterns."""
+    root = os.path.abspath("docs")
+    handler = _make_handler(root, [])
+    
+    assert not handler._is_excluded(os.path.join(root, "node_modules", "a.md"))
+
+
+def test_is_markdown_file():
+    """Test that markdown files are recognized by extension, in any case."""
+    handler = _make_handler("/notes", [])
+    
+    assert handler._is_markdown_file("/notes/a.md")
+    assert handler._is_markdown_file("/notes/B.MARKDOWN")
+    assert not handler._is_markdown_file("/notes/a.md.swp")
+    assert not handler._is_markdown_file("/notes/a.mdx")
+    assert not handler._is_markdown_file("/notes/md")
+    assert not handler._is_markdown_file("/notes.md/readme")
+
+
+def test_events_are_debounced_per_path():
+    """Test that a burst of events for one file triggers a single callback."""
+    calls = []
+    handler = _make_handler(os.path.abspath("docs"), [], calls.append)
+    handler._debounce_seconds = 0.05
+    
+    start = time.monotonic()
+    for _ in range(5):
+        handler._debounce_event("docs/a.md")
+    handler._debounce_event("docs/b.md")
+    
+    # The events were only scheduled, not waited for
+    assert time.monotonic() - start < 0.05
+    
+    time.sleep(0.3)
+    assert sorted(calls) == ["docs/a.md", "docs/b.md"]
+    assert handler._timers == {}
+
+
+def test_atomic_saves_are_handled_by_destination():
+    """Test that a temp file renamed over a markdown file counts as a change."""
+    calls = []
+    root = os.path.abspath("docs")
+    handler = _make_handler(root, [], calls.append)
+    handler._debounce_seconds = 0.01
+    
+    target = os.path.join(root, "a.md")
+    handler.on_moved(FileMovedEvent(target + ".1234.tmp", target))
+    handler.on_moved(FileMovedEvent(target, os.path.join(root, "a.md.bak")))
+    
+    time.sleep(0.2)
+    assert calls == [target]
+
+
+def test_callbacks_for_one_path_never_overlap():
+    """Test that changes during a running sync are coalesced into one rerun."""
+    calls = []
+    running = []
+    overlapped = []
+    
+    def callback(path):
+        if path in running:
+            overlapped.append(path)
+        running.append(path)
+        calls.append(path)
+        time.sleep(0.15)
+        running.remove(path)
+    
+    handler = _make_handler(os.path.abspath("docs"), [], callback)
+    handler._debounce_seconds = 0.01
+    
+    handler._debounce_event("docs/a.md")
+    time.sleep(0.05)
+    # Three separate changes while the first sync is still running
+    for _ in range(3):
+        handler._debounce_event("docs/a.md")
+        time.sleep(0.03)
+    
+    time.sleep(0.5)
+    assert calls == ["docs/a.md", "docs/a.md"]
+    assert overlapped == []
+    assert handler._running == set()
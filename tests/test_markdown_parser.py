@@ -5,6 +5,7 @@ Tests for markdown parser functionality.
 import os
 import tempfile
 import pytest
+import frontmatter
 from notion_md_sync.markdown_parser import MarkdownParser
 
 
@@ -158,4 +159,110 @@ More content.
     assert len(headings) == 3
     assert headings[0] == (1, "Main Heading")
     assert headings[1] == (2, "Secondary Heading")
-    assert headings[2] == (3, "Tertiary Heading")
\ No newline at end of file
+    assert headings[2] == (3, "Tertiary Heading")
+
+
+def test_parse_file_raw_matches_parse_file():
+    """Test that the raw parse returns the same frontmatter and content."""
+    with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.md') as f:
+        f.write("""---
+title: Raw Document
+---
+# Heading
+
+Some *text*.
+""")
+        file_path = f.name
+    
+    try:
+        parser = MarkdownParser()
+        metadata, html_content, raw_content = parser.parse_file(file_path)
+        
+        assert parser.parse_file_raw(file_path) == (metadata, raw_content)
+        assert parser.render_html(raw_content) == html_content
+        assert "<em>text</em>" in html_content
+    finally:
+        os.unlink(file_path)
+
+
+def test_parse_frontmatter_only():
+    """Test reading just the frontmatter of markdown files."""
+    cases = [
+        ("---\nnotion_page_id: abc123\ntags:\n  - a\n---\n# Body\n", {"notion_page_id": "abc123", "tags": ["a"]}),
+        ("\n\n---\ntitle: Indented start\n---\nBody", {"title": "Indented start"}),
+        ("# No frontmatter\n\n---\ntitle: not frontmatter\n---\n", {}),
+        ("---\ntitle: never closed\n", {}),
+    ]
+    parser = MarkdownParser()
+    
+    for content, expected in cases:
+        with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.md') as f:
+            f.write(content)
+            file_path = f.name
+        
+        try:
+            assert parser.parse_frontmatter_only(file_path) == expected
+            assert parser.parse_frontmatter_only(file_path) == parser.parse_file_raw(file_path)[0]
+        finally:
+            os.unlink(file_path)
+
+
+def test_missing_file_raises():
+    """Test that every reader reports a missing file the same way."""
+    parser = MarkdownParser()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        missing_path = os.path.join(temp_dir, "missing.md")
+        
+        for read in (parser.parse_file, parser.parse_frontmatter_only):
+            with pytest.raises(FileNotFoundError, match="Markdown file not found"):
+                read(missing_path)
+        with pytest.raises(FileNotFoundError, match="Markdown file not found"):
+            parser.update_frontmatter(missing_path, {"title": "Missing"})
+
+
+def test_parse_results_are_cached_until_file_changes(monkeypatch):
+    """Test that unchanged files are parsed once and rewritten files again."""
+    loads = []
+    real_load = frontmatter.load
+    
+    def counting_load(fd, *args, **kwargs):
+        loads.append(fd)
+        return real_load(fd, *args, **kwargs)
+    
+    monkeypatch.setattr(frontmatter, "load", counting_load)
+    parser = MarkdownParser()
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_path = os.path.join(temp_dir, "note.md")
+        with open(file_path, "w") as f:
+            f.write("---\ntitle: Note\n---\n# Note\n")
+        
+        metadata, raw_content = parser.parse_file_raw(file_path)
+        metadata["title"] = "Changed by caller"
+        metadata, html_content, _ = parser.parse_file(file_path)
+        assert metadata == {"title": "Note"}
+        assert "<h1" in html_content
+        assert len(loads) == 1
+        
+        parser.update_frontmatter(file_path, {"notion_page_id": "abc"})
+        metadata, _ = parser.parse_file_raw(file_path)
+        assert metadata == {"title": "Note", "notion_page_id": "abc"}
+        
+        with open(file_path, "w") as f:
+            f.write("---\ntitle: Rewritten by an editor\n---\n")
+        assert parser.parse_file_raw(file_path)[0]["title"] == "Rewritten by an editor"
+
+
+def test_update_frontmatter_keeps_key_order():
+    """Test that rewriting frontmatter doesn't sort the user's keys."""
+    parser = MarkdownParser()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_path = os.path.join(temp_dir, "note.md")
+        with open(file_path, "w") as f:
+            f.write("---\ntitle: Note\ndate: '2024-01-01'\nauthor: Me\n---\n# Note\n")
+        
+        parser.update_frontmatter(file_path, {"notion_page_id": "abc"})
+        
+        with open(file_path) as f:
+            content = f.read()
+        assert content.startswith("---\ntitle: Note\ndate: '2024-01-01'\nauthor: Me\nnotion_page_id: abc\n---\n")
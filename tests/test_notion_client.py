@@ -0,0 +1,232 @@
+"""
+Tests for the Notion API client wrapper.
+"""
+
+import pytest
+from notion_client.errors import RequestTimeoutError
+from notion_md_sync.notion_client import NotionClient, PageNotFoundError, close_clients, get_client
+from notion_md_sync.rate_limiter import RateLimiter
+
+
+def test_search_pages_follows_cursor(monkeypatch):
+    """Test that search results from every result page are returned."""
+    client = NotionClient("secret_test")
+    calls = []
+    
+    def search(**kwargs):
+        calls.append(kwargs)
+        if kwargs.get("start_cursor") is None:
+            return {"results": [{"id": "a"}, {"id": "b"}], "has_more": True, "next_cursor": "c1"}
+        return {"results": [{"id": "c"}], "has_more": False, "next_cursor": None}
+    
+    monkeypatch.setattr(client.client, "search", search)
+    
+    pages = client.search_pages(query="notes")
+    
+    assert [page["id"] for page in pages] == ["a", "b", "c"]
+    assert "start_cursor" not in calls[0]
+    assert calls[1]["start_cursor"] == "c1"
+    assert all(call["query"] == "notes" for call in calls)
+
+
+def test_clients_share_one_api_client_per_token():
+    """Test that wrappers for the same token share one connection pool."""
+    first = NotionClient("secret_shared")
+    second = NotionClient("secret_shared")
+    other = NotionClient("secret_other")
+    
+    assert first.client is second.client
+    assert first.client is not other.client
+
+
+def test_close_clients_starts_fresh_pools():
+    """Test that closing the shared clients closes their pools and drops them."""
+    client = get_client("secret_closed")
+    
+    close_clients()
+    
+    assert client.client.is_closed
+    assert get_client("secret_closed") is not client
+
+
+def test_get_page_blocks_follows_cursor(monkeypatch):
+    """Test that blocks from every result page are returned, 100 at a time."""
+    client = NotionClient("secret_test")
+    calls = []
+    
+    def list_children(**kwargs):
+        calls.append(kwargs)
+        if kwargs.get("start_cursor") is None:
+            return {"results": [{"id": "a"}, {"id": "b"}], "has_more": True, "next_cursor": "c1"}
+        return {"results": [{"id": "c"}], "has_more": False, "next_cursor": None}
+    
+    monkeypatch.setattr(client.client.blocks.children, "list", list_children)
+    
+    blocks = client.get_page_blocks("page")
+    
+    assert [block["id"] for block in blocks] == ["a", "b", "c"]
+    assert [call["start_cursor"] for call in calls] == [None, "c1"]
+    assert all(call["page_size"] == 100 for call in calls)
+
+
+def test_get_page_blocks_interns_block_types(monkeypatch):
+    """Test that block types from separate responses share one string."""
+    client = NotionClient("secret_test")
+    
+    def list_children(**kwargs):
+        # Build the type names at runtime, as the JSON decoder would
+        block_type = "".join(["para", "graph"])
+        return {"results": [{"object": "block", "type": block_type, block_type: {"rich_text": []}}], "has_more": False}
+    
+    monkeypatch.setattr(client.client.blocks.children, "list", list_children)
+    
+    first = client.get_page_blocks("page")[0]
+    second = client.get_page_blocks("page")[0]
+    
+    assert first["type"] is second["type"]
+    assert first["paragraph"] == {"rich_text": []}
+
+
+def test_update_page_blocks_deletes_every_block(monkeypatch):
+    """Test that replacing page content deletes all existing blocks first."""
+    client = NotionClient("secret_test")
+    deleted = []
+    
+    def list_children(block_id, start_cursor=None, page_size=None):
+        return {"results": [{"id": f"block-{i}"} for i in range(20)], "has_more": False}
+    
+    def delete(block_id):
+        deleted.append(block_id)
+        return {"id": block_id, "archived": True}
+    
+    def append(block_id, children):
+        assert len(deleted) == 20
+        return {"results": children}
+    
+    monkeypatch.setattr(client.client.blocks.children, "list", list_children)
+    monkeypatch.setattr(client.client.blocks.children, "append", append)
+    monkeypatch.setattr(client.client.blocks, "delete", delete)
+    client.rate_limiter.rate = 1000.0
+    
+    new_blocks = [{"type": "paragraph"}]
+    assert client.update_page_blocks("page", new_blocks) == new_blocks
+    assert sorted(deleted) == sorted(f"block-{i}" for i in range(20))
+
+
+def test_append_blocks_sends_chunks_in_order(monkeypatch):
+    """Test that long documents are appended 100 blocks at a time, in order."""
+    client = NotionClient("secret_test")
+    chunks = []
+    
+    def append(block_id, children):
+        chunks.append(children)
+        return {"results": [{"id": block["id"]} for block in children]}
+    
+    monkeypatch.setattr(client.client.blocks.children, "append", append)
+    client.rate_limiter.rate = 1000.0
+    
+    blocks = [{"id": i, "type": "paragraph"} for i in range(250)]
+    results = client.append_blocks("page", blocks)
+    
+    assert [len(chunk) for chunk in chunks] == [100, 100, 50]
+    assert [block["id"] for block in results] == list(range(250))
+    assert client.append_blocks("page", []) == []
+    assert len(chunks) == 3
+
+
+def test_get_database_is_cached(monkeypatch):
+    """Test that database lookups, including misses, happen once per ID."""
+    client = NotionClient("secret_test")
+    retrieved = []
+    
+    class NotFound(Exception):
+        code = "object_not_found"
+    
+    def retrieve(database_id):
+        retrieved.append(database_id)
+        if database_id.startswith("0"):
+            raise NotFound()
+        return {"id": database_id, "properties": {"Name": {"type": "title"}}}
+    
+    monkeypatch.setattr(client.client.databases, "retrieve", retrieve)
+    
+    db_id = "1a2b3c4d5e6f7a8b9c0d1e2f3a4b5c6d"
+    page_id = "0a2b3c4d5e6f7a8b9c0d1e2f3a4b5c6d"
+    
+    assert client.get_database(db_id)["id"] == db_id
+    assert client.get_database("1a2b3c4d-5e6f-7a8b-9c0d-1e2f3a4b5c6d")["id"] == db_id
+    assert client.get_database(page_id) is None
+    assert client.get_database(page_id) is None
+    assert retrieved == [db_id, page_id]
+
+
+def test_get_database_does_not_cache_failed_lookups(monkeypatch):
+    """Test that timeouts and rate limits are not remembered as "not a database"."""
+    client = NotionClient("secret_test", RateLimiter(rate=1000.0, burst=10, max_retries=0))
+    retrieved = []
+    
+    class RateLimited(Exception):
+        code = "rate_limited"
+        headers = {}
+    
+    def retrieve(database_id):
+        retrieved.append(database_id)
+        if database_id.startswith("0"):
+            raise RequestTimeoutError()
+        raise RateLimited()
+    
+    monkeypatch.setattr(client.client.databases, "retrieve", retrieve)
+    
+    timeout_id = "0a2b3c4d5e6f7a8b9c0d1e2f3a4b5c6d"
+    limited_id = "1a2b3c4d5e6f7a8b9c0d1e2f3a4b5c6d"
+    
+    for db_id in (timeout_id, limited_id):
+        assert client.get_database(db_id) is None
+        assert client.is_database(db_id) is None
+    assert retrieved == [timeout_id, timeout_id, limited_id, limited_id]
+
+
+def test_get_page_distinguishes_missing_pages(monkeypatch):
+    """Test that only Notion's not-found answer raises PageNotFoundError."""
+    client = NotionClient("secret_test")
+    
+    class NotFound(Exception):
+        code = "object_not_found"
+        status = 404
+    
+    def retrieve(page_id):
+        if page_id == "missing":
+            raise NotFound()
+        raise ConnectionError("offline")
+    
+    monkeypatch.setattr(client.client.pages, "retrieve", retrieve)
+    
+    with pytest.raises(PageNotFoundError):
+        client.get_page("missing")
+    with pytest.raises(ConnectionError):
+        client.get_page("elsewhere")
+
+
+def test_get_child_pages_keeps_order_and_skips_failures(monkeypatch, capsys):
+    """Test that child pages come back in block order, without inaccessible ones."""
+    client = NotionClient("secret_test")
+    blocks = [
+        {"id": "child-1", "type": "child_page"},
+        {"id": "para", "type": "paragraph"},
+        {"id": "child-2", "type": "child_page"},
+        {"id": "child-3", "type": "child_page"},
+    ]
+    
+    def get_page(page_id):
+        if page_id == "child-2":
+            raise Exception("no access")
+        return {"id": page_id}
+    
+    monkeypatch.setattr(client, "iter_page_blocks", lambda page_id: iter(blocks))
+    monkeypatch.setattr(client, "get_page", get_page)
+    
+    pages = client.get_child_pages("parent")
+    
+    assert [page["id"] for page in pages] == ["child-1", "child-3"]
+    assert "Could not access child page child-2" in capsys.readouterr().out
+
@@ -0,0 +1,101 @@
+"""
+Tests for Notion API rate limiting.
+"""
+
+import pytest
+from notion_md_sync import rate_limiter as rate_limiter_module
+from notion_md_sync.rate_limiter import RateLimiter
+
+
+class RateLimitedError(Exception):
+    """Stand-in for notion_client's APIResponseError on HTTP 429."""
+
+    code = "rate_limited"
+
+    def __init__(self, retry_after):
+        super().__init__("rate limited")
+        self.headers = {"Retry-After": retry_after}
+
+
+class ServerError(Exception):
+    """Stand-in for notion_client's APIResponseError on HTTP 503."""
+
+    code = "service_unavailable"
+    status = 503
+    headers = {}
+
+
+def test_burst_does_not_wait(monkeypatch):
+    """Test that requests within the burst size are sent immediately."""
+    sleeps = []
+    monkeypatch.setattr(rate_limiter_module.time, "sleep", sleeps.append)
+    
+    limiter = RateLimiter(rate=3.0, burst=3)
+    for _ in range(3):
+        limiter.acquire()
+    
+    assert sleeps == []
+    
+    # The next request has to wait for a token to be refilled
+    limiter.acquire()
+    assert len(sleeps) == 1
+    assert 0 < sleeps[0] <= 1 / 3
+
+
+def test_call_retries_rate_limited_requests(monkeypatch):
+    """Test that rate-limited requests are retried after Retry-After."""
+    sleeps = []
+    monkeypatch.setattr(rate_limiter_module.time, "sleep", sleeps.append)
+    
+    attempts = []
+    
+    def request(page_id):
+        attempts.append(page_id)
+        if len(attempts) < 3:
+            raise RateLimitedError("2")
+        return {"id": page_id}
+    
+    limiter = RateLimiter(rate=1000.0, burst=10)
+    
+    assert limiter.call(request, page_id="abc") == {"id": "abc"}
+    assert attempts == ["abc", "abc", "abc"]
+    assert len(sleeps) == 2
+    assert all(2 <= s <= 2.25 for s in sleeps)
+
+
+def test_call_does_not_retry_other_errors(monkeypatch):
+    """Test that errors other than rate limiting propagate immediately."""
+    monkeypatch.setattr(rate_limiter_module.time, "sleep", lambda seconds: None)
+    
+    def request():
+        raise ValueError("boom")
+    
+    with pytest.raises(ValueError):
+        RateLimiter().call(request)
+
+
+def test_call_retries_server_errors_when_asked(monkeypatch):
+    """Test that 5xx responses are retried with backoff only for safe requests."""
+    sleeps = []
+    monkeypatch.setattr(rate_limiter_module.time, "sleep", sleeps.append)
+    
+    attempts = []
+    
+    def request():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise ServerError()
+        return "ok"
+    
+    limiter = RateLimiter(rate=1000.0, burst=10)
+    
+    assert limiter.call(request, retry_server_errors=True) == "ok"
+    assert len(attempts) == 3
+    assert 0.25 <= sleeps[0] <= 0.5
+    assert 0.5 <= sleeps[1] <= 0.75
+    
+    # Writes are not repeated, they may have gone through
+    attempts.clear()
+    with pytest.raises(ServerError):
+        limiter.call(request)
+    assert len(attempts) == 1
@@ -0,0 +1,387 @@
+"""
+Tests for the sync engine.
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+import pytest
+from notion_client.errors import RequestTimeoutError
+from notion_md_sync.config import Config
+from notion_md_sync.notion_client import PageNotFoundError
+from notion_md_sync.sync_engine import SyncEngine
+
+
+@pytest.fixture(autouse=True)
+def cache_home(monkeypatch):
+    """Keep the engine's cross-run caches out of the real cache directory."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        monkeypatch.setenv("XDG_CACHE_HOME", temp_dir)
+        yield temp_dir
+
+
+def _make_engine():
+    """Create a sync engine with a test token and no config file."""
+    config = Config("nonexistent.yaml")
+    config.set("notion.token", "secret_test")
+    config.set("notion.parent_page_id", "1a2b3c4d5e6f7a8b9c0d1e2f3a4b5c6d")
+    return SyncEngine(config)
+
+
+def test_sync_files_to_notion_runs_files_concurrently(monkeypatch):
+    """Test that several files are pushed side by side and all reported."""
+    engine = _make_engine()
+    running = []
+    peak = []
+    lock = threading.Lock()
+    
+    def sync_file_to_notion(file_path):
+        with lock:
+            running.append(file_path)
+            peak.append(len(running))
+        time.sleep(0.05)
+        with lock:
+            running.remove(file_path)
+        return file_path != "bad.md", f"synced {file_path}"
+    
+    monkeypatch.setattr(engine, "_get_parent_kind", lambda parent_id: "page")
+    monkeypatch.setattr(engine, "sync_file_to_notion", sync_file_to_notion)
+    
+    files = ["a.md", "b.md", "bad.md", "c.md"]
+    results = list(engine.sync_files_to_notion(files, concurrency=4))
+    
+    assert sorted(results) == sorted(
+        (file, file != "bad.md", f"synced {file}") for file in files
+    )
+    assert max(peak) > 1
+
+
+def test_sync_directory_probes_the_parent_once(monkeypatch):
+    """Test that a directory sync covers all files and looks up the parent once."""
+    engine = _make_engine()
+    probes = []
+    
+    def is_database(parent_id):
+        probes.append(parent_id)
+        time.sleep(0.05)
+        return False
+    
+    monkeypatch.setattr(engine.notion_client, "is_database", is_database)
+    monkeypatch.setattr(engine.notion_client, "create_page", lambda parent_id, title, properties: {"id": title})
+    monkeypatch.setattr(engine.notion_client, "update_page_blocks", lambda page_id, blocks: [])
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        engine.config.set("directories.excluded_patterns", ["drafts/**"])
+        os.makedirs(os.path.join(temp_dir, "notes"))
+        os.makedirs(os.path.join(temp_dir, "drafts"))
+        for name in ("a.md", "notes/b.md", "notes/c.md", "drafts/d.md"):
+            with open(os.path.join(temp_dir, name), "w") as f:
+                f.write("# Note\n")
+        
+        results = list(engine.sync_directory(temp_dir))
+    
+    assert sorted(os.path.relpath(path, temp_dir) for path, _, _ in results) == [
+        "a.md", os.path.join("notes", "b.md"), os.path.join("notes", "c.md")
+    ]
+    assert all(success for _, success, _ in results)
+    assert len(probes) == 1
+
+
+def test_sync_directory_probes_the_parent_only_for_new_pages(monkeypatch):
+    """Test that linked files skip the parent lookup and a bad parent ID fails per file."""
+    engine = _make_engine()
+    probes = []
+    
+    monkeypatch.setattr(engine.notion_client, "is_database", lambda parent_id: probes.append(parent_id))
+    monkeypatch.setattr(engine, "_page_exists", lambda page_id: True)
+    monkeypatch.setattr(engine.notion_client, "update_page_blocks", lambda page_id, blocks: [])
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        with open(os.path.join(temp_dir, "linked.md"), "w") as f:
+            f.write("---\nnotion_page_id: page-1\n---\n# Linked\n")
+        
+        assert [success for _, success, _ in engine.sync_directory(temp_dir)] == [True]
+        assert probes == []
+        
+        engine.config.set("notion.parent_page_id", "not-an-id")
+        with open(os.path.join(temp_dir, "new.md"), "w") as f:
+            f.write("# New\n")
+        
+        results = dict((os.path.basename(path), success) for path, success, _ in engine.sync_directory(temp_dir))
+    
+    assert results == {"linked.md": True, "new.md": False}
+
+
+def test_parent_kind_is_probed_once(monkeypatch):
+    """Test that a parent's kind is looked up once, whichever ID form is used."""
+    engine = _make_engine()
+    retrieved = []
+    
+    class NotADatabase(Exception):
+        code = "validation_error"
+    
+    def retrieve(database_id):
+        retrieved.append(database_id)
+        if database_id.startswith("0"):
+            raise NotADatabase(f"Provided ID {database_id} is a page, not a database.")
+        if database_id.startswith("f"):
+            raise ConnectionError("offline")
+        return {"id": database_id, "properties": {}}
+    
+    monkeypatch.setattr(engine.notion_client.client.databases, "retrieve", retrieve)
+    
+    db_id = "1a2b3c4d5e6f7a8b9c0d1e2f3a4b5c6d"
+    page_id = "0a2b3c4d-5e6f-7a8b-9c0d-1e2f3a4b5c6d"
+    offline_id = "fa2b3c4d5e6f7a8b9c0d1e2f3a4b5c6d"
+    
+    assert engine._get_parent_kind(db_id) == "database"
+    assert engine._get_parent_kind("1a2b3c4d-5e6f-7a8b-9c0d-1e2f3a4b5c6d") == "database"
+    assert engine._get_parent_kind(page_id) == "page"
+    assert engine._get_parent_kind(page_id.replace("-", "")) == "page"
+    assert len(retrieved) == 2
+    
+    # Failed lookups are retried next time
+    assert engine._get_parent_kind(offline_id) == "page"
+    assert engine._get_parent_kind(offline_id) == "page"
+    assert len(retrieved) == 4
+    
+    # A new run starts with the answers from this one
+    next_run = _make_engine()
+    monkeypatch.setattr(next_run.notion_client.client.databases, "retrieve", retrieve)
+    assert next_run._get_parent_kind(db_id) == "database"
+    assert next_run._get_parent_kind(page_id) == "page"
+    assert len(retrieved) == 4
+
+
+def test_unsettled_parent_kind_is_not_saved(monkeypatch, cache_home):
+    """Test that a failed lookup leaves the parent kind cache file unchanged."""
+    engine = _make_engine()
+    engine._remember_parent_kind("1a2b3c4d-5e6f-7a8b-9c0d-1e2f3a4b5c6d", "database")
+    cache_path = os.path.join(cache_home, "notion-md-sync", "parent_kind.json")
+    with open(cache_path) as f:
+        saved = f.read()
+    
+    class NotShared(Exception):
+        code = "object_not_found"
+    
+    def retrieve(database_id):
+        if database_id.startswith("a"):
+            raise RequestTimeoutError()
+        raise NotShared()
+    
+    monkeypatch.setattr(engine.notion_client.client.databases, "retrieve", retrieve)
+    
+    assert engine._get_parent_kind("aaaaaaaa-5e6f-7a8b-9c0d-1e2f3a4b5c6d") == "page"
+    assert engine._get_parent_kind("ba2b3c4d-5e6f-7a8b-9c0d-1e2f3a4b5c6d") == "page"
+    with open(cache_path) as f:
+        assert f.read() == saved
+
+
+def test_parent_kinds_from_other_engines_are_kept(cache_home):
+    """Test that engines saving parent kinds side by side don't drop each other's."""
+    first = _make_engine()
+    second = _make_engine()
+    
+    first._remember_parent_kind("1a2b3c4d-5e6f-7a8b-9c0d-1e2f3a4b5c6d", "database")
+    second._remember_parent_kind("0a2b3c4d-5e6f-7a8b-9c0d-1e2f3a4b5c6d", "page")
+    
+    with open(os.path.join(cache_home, "notion-md-sync", "parent_kind.json")) as f:
+        assert json.load(f) == {
+            "1a2b3c4d-5e6f-7a8b-9c0d-1e2f3a4b5c6d": "database",
+            "0a2b3c4d-5e6f-7a8b-9c0d-1e2f3a4b5c6d": "page",
+        }
+
+
+def test_new_page_frontmatter_is_written_once(monkeypatch):
+    """Test that creating a page links the file with a single frontmatter write."""
+    engine = _make_engine()
+    writes = []
+    
+    monkeypatch.setattr(engine, "_get_parent_kind", lambda parent_id: "page")
+    monkeypatch.setattr(engine.notion_client, "create_page", lambda parent_id, title, properties: {"id": "new-page"})
+    monkeypatch.setattr(engine.notion_client, "update_page_blocks", lambda page_id, blocks: [])
+    monkeypatch.setattr(engine.markdown_parser, "update_frontmatter", lambda path, updates: writes.append(updates))
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_path = os.path.join(temp_dir, "note.md")
+        with open(file_path, "w") as f:
+            f.write("# Note\n\nSome text.\n")
+        
+        success, message = engine.sync_file_to_notion(file_path)
+    
+    assert success, message
+    assert len(writes) == 1
+    assert writes[0]["notion_page_id"] == "new-page"
+    assert "last_synced" in writes[0]
+
+
+def test_known_pages_skip_the_existence_probe(monkeypatch):
+    """Test that repeated pushes fetch a page once and recover if it was deleted."""
+    engine = _make_engine()
+    fetched = []
+    pages = {"page-1"}
+    created = []
+    
+    def get_page(page_id):
+        fetched.append(page_id)
+        if page_id not in pages:
+            raise PageNotFoundError(page_id)
+        return {"id": page_id}
+    
+    def update_page_blocks(page_id, blocks):
+        if page_id not in pages:
+            raise Exception("object_not_found")
+        return []
+    
+    def create_page(parent_id, title, properties):
+        created.append(title)
+        pages.add("page-2")
+        return {"id": "page-2"}
+    
+    monkeypatch.setattr(engine, "_get_parent_kind", lambda parent_id: "page")
+    monkeypatch.setattr(engine.notion_client, "get_page", get_page)
+    monkeypatch.setattr(engine.notion_client, "update_page_blocks", update_page_blocks)
+    monkeypatch.setattr(engine.notion_client, "create_page", create_page)
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_path = os.path.join(temp_dir, "note.md")
+        with open(file_path, "w") as f:
+            f.write("---\nnotion_page_id: page-1\n---\n# Note\n")
+        
+        assert engine.sync_file_to_notion(file_path)[0]
+        assert engine.sync_file_to_notion(file_path)[0]
+        assert fetched == ["page-1"]
+        
+        # Deleted in Notion after it was last seen
+        pages.discard("page-1")
+        success, message = engine.sync_file_to_notion(file_path)
+        
+        assert success, message
+        assert created == ["Note"]
+        assert engine.markdown_parser.parse_file_raw(file_path)[0]["notion_page_id"] == "page-2"
+
+
+def test_failed_existence_probe_does_not_create_a_page(monkeypatch):
+    """Test that a page is only recreated when Notion says it is gone."""
+    engine = _make_engine()
+    created = []
+    
+    def get_page(page_id):
+        raise ConnectionError("offline")
+    
+    monkeypatch.setattr(engine.notion_client, "get_page", get_page)
+    monkeypatch.setattr(engine.notion_client, "create_page", lambda *args: created.append(args))
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_path = os.path.join(temp_dir, "note.md")
+        with open(file_path, "w") as f:
+            f.write("---\nnotion_page_id: page-1\n---\n# Note\n")
+        
+        success, message = engine.sync_file_to_notion(file_path)
+    
+    assert not success
+    assert "offline" in message
+    assert created == []
+
+
+def test_detect_conflicts_compares_local_and_utc_times(monkeypatch):
+    """Test that conflicts need changes on both sides since the last sync."""
+    engine = _make_engine()
+    edited = {"last_edited_time": "2024-01-01T12:00:00.000Z"}
+    monkeypatch.setattr(engine.notion_client, "get_page", lambda page_id: edited)
+    
+    # last_synced is written in local time, Notion's times are UTC
+    synced_at = datetime(2024, 1, 1, 11, 0, tzinfo=timezone.utc).astimezone().replace(tzinfo=None)
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_path = os.path.join(temp_dir, "note.md")
+        with open(file_path, "w") as f:
+            f.write(f"---\nlast_synced: '{synced_at.isoformat()}'\n---\n# Note\n")
+        
+        def set_mtime(hour, minute):
+            mtime = datetime(2024, 1, 1, hour, minute, tzinfo=timezone.utc).timestamp()
+            os.utime(file_path, (mtime, mtime))
+        
+        # Written by the sync itself
+        set_mtime(11, 0)
+        assert engine.detect_conflicts(file_path, "page") is False
+        
+        # Edited locally and in Notion
+        set_mtime(11, 30)
+        assert engine.detect_conflicts(file_path, "page") is True
+        
+        # Edited locally only
+        edited["last_edited_time"] = "2024-01-01T10:00:00.000Z"
+        assert engine.detect_conflicts(file_path, "page") is False
+
+
+def test_detect_conflicts_does_not_render_html(monkeypatch):
+    """Test that conflict detection only reads the frontmatter."""
+    engine = _make_engine()
+    
+    def render_html(raw_content):
+        raise AssertionError("HTML was rendered")
+    
+    monkeypatch.setattr(engine.markdown_parser, "render_html", render_html)
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_path = os.path.join(temp_dir, "note.md")
+        with open(file_path, "w") as f:
+            f.write("---\ntitle: Never synced\n---\n# Note\n")
+        
+        assert engine.detect_conflicts(file_path, "page") is False
+
+
+def test_database_pages_get_metadata_properties(monkeypatch):
+    """Test that frontmatter becomes text properties, except sync bookkeeping."""
+    engine = _make_engine()
+    created = []
+    
+    def create_page(parent_id, title, properties):
+        created.append(properties)
+        return {"id": "new-page"}
+    
+    monkeypatch.setattr(engine, "_get_parent_kind", lambda parent_id: "database")
+    monkeypatch.setattr(engine.notion_client, "create_page", create_page)
+    monkeypatch.setattr(engine.notion_client, "update_page_blocks", lambda page_id, blocks: [])
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_path = os.path.join(temp_dir, "note.md")
+        with open(file_path, "w") as f:
+            f.write("---\ntitle: Note\nstatus: draft\nlast_synced: '2024-01-01T00:00:00'\n---\n# Note\n")
+        
+        assert engine.sync_file_to_notion(file_path)[0]
+    
+    assert sorted(created[0]) == ["status", "title"]
+    assert created[0]["status"]["rich_text"][0]["text"]["content"] == "draft"
+
+
+def test_pulled_page_title_and_properties(monkeypatch):
+    """Test that pulls read the title and text properties, tolerating empty ones."""
+    engine = _make_engine()
+    page = {
+        "id": "page",
+        "properties": {
+            "title": {"type": "title", "title": []},
+            "Status": {"type": "rich_text", "rich_text": [{"type": "text", "text": {"content": "draft"}}]},
+            "Ref": {"type": "rich_text", "rich_text": [{"type": "mention", "mention": {}}]},
+            "Empty": {"type": "rich_text", "rich_text": []},
+        },
+    }
+    monkeypatch.setattr(engine.notion_client, "get_page", lambda page_id: page)
+    monkeypatch.setattr(engine.notion_client, "iter_page_blocks", lambda page_id: iter([]))
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_path = os.path.join(temp_dir, "note.md")
+        success, message = engine.sync_notion_to_file("page", file_path)
+        assert success, message
+        
+        metadata = engine.markdown_parser.parse_frontmatter_only(file_path)
+    
+    assert metadata["title"] == "Untitled"
+    assert metadata["Status"] == "draft"
+    assert metadata["Ref"] == ""
+    assert "Empty" not in metadata
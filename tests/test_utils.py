@@ -0,0 +1,109 @@
+"""
+Tests for shared helpers.
+"""
+
+import os
+import tempfile
+import pytest
+from notion_md_sync.utils import atomic_write_text, format_notion_id, iter_markdown_files, notion_id_key, page_title, sanitize_filename
+
+
+def test_sanitize_filename():
+    """Test turning page titles into file names."""
+    assert sanitize_filename("My Project: Notes (v2)") == "my-project-notes-v2"
+    assert sanitize_filename("snake_case - title") == "snake_case---title"
+    assert sanitize_filename("Café Menü") == "café-menü"
+    assert sanitize_filename("!!!") == ""
+
+
+def test_iter_markdown_files_honours_exclusions():
+    """Test that markdown discovery skips excluded files and directories."""
+    with tempfile.TemporaryDirectory() as root:
+        for rel_path in [
+            "index.md",
+            "notes.MARKDOWN",
+            "draft.md.tmp",
+            "readme.txt",
+            "guide/intro.md",
+            "node_modules/pkg/README.md",
+            "guide/node_modules/deep.md",
+        ]:
+            path = os.path.join(root, *rel_path.split("/"))
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w") as f:
+                f.write("# Title")
+        
+        found = iter_markdown_files(root, ["*.tmp", "node_modules/**"])
+        rel_found = sorted(os.path.relpath(p, root).replace(os.sep, "/") for p in found)
+        
+        assert rel_found == ["guide/intro.md", "index.md", "notes.MARKDOWN"]
+
+
+def test_iter_markdown_files_skips_vanished_directories():
+    """Test that a subdirectory removed during the walk is skipped, but a missing root is not."""
+    with tempfile.TemporaryDirectory() as root:
+        os.makedirs(os.path.join(root, "sub"))
+        for rel_path in ("index.md", os.path.join("sub", "page.md")):
+            with open(os.path.join(root, rel_path), "w") as f:
+                f.write("# Page\n")
+        
+        found = iter_markdown_files(root)
+        first = next(found)
+        os.remove(os.path.join(root, "sub", "page.md"))
+        os.rmdir(os.path.join(root, "sub"))
+        
+        assert [first] + list(found) == [os.path.join(root, "index.md")]
+        
+        with pytest.raises(OSError):
+            list(iter_markdown_files(os.path.join(root, "missing")))
+
+
+def test_page_title():
+    """Test reading page titles, including pages without one."""
+    page = {"properties": {"title": {"title": [{"text": {"content": "Hello"}}]}}}
+    
+    assert page_title(page) == "Hello"
+    assert page_title({"properties": {"title": {"title": []}}}) == "Untitled"
+    assert page_title({}, "Unknown") == "Unknown"
+
+
+def test_format_notion_id():
+    """Test formatting Notion IDs as dashed UUIDs."""
+    dashed = "1a2b3c4d-5e6f-7a8b-9c0d-1e2f3a4b5c6d"
+    
+    assert format_notion_id("1a2b3c4d5e6f7a8b9c0d1e2f3a4b5c6d") == dashed
+    assert format_notion_id(dashed) == dashed
+    assert format_notion_id(dashed.upper()) == dashed
+    
+    with pytest.raises(ValueError):
+        format_notion_id("not-a-page-id")
+
+
+def test_notion_id_key():
+    """Test that every spelling of an ID maps to the same cache key."""
+    dashed = "1a2b3c4d-5e6f-7a8b-9c0d-1e2f3a4b5c6d"
+    
+    assert notion_id_key("1A2B3C4D5E6F7A8B9C0D1E2F3A4B5C6D") == dashed
+    assert notion_id_key(dashed) == dashed
+    assert notion_id_key("not-a-page-id") == "not-a-page-id"
+
+
+def test_atomic_write_text_keeps_mode_and_symlinks():
+    """Test that atomic rewrites keep permissions and symlinks and leave no temp files."""
+    with tempfile.TemporaryDirectory() as root:
+        file_path = os.path.join(root, "note.md")
+        link_path = os.path.join(root, "link.md")
+        with open(file_path, "w") as f:
+            f.write("old")
+        os.chmod(file_path, 0o640)
+        os.symlink(file_path, link_path)
+        
+        atomic_write_text(link_path, "new")
+        
+        assert os.path.islink(link_path)
+        with open(file_path) as f:
+            assert f.read() == "new"
+        assert os.stat(file_path).st_mode & 0o777 == 0o640
+        
+        atomic_write_text(os.path.join(root, "new.md"), "created", fsync=True)
+        assert sorted(os.listdir(root)) == ["link.md", "new.md", "note.md"]